@@ -5,9 +5,18 @@ from typing import Dict, Any
 This module provides functionality for processing and cleaning C code.
 """
 
+# Characters that can move the comment scanner out of its CODE state
+_SCAN_STOP_RE = re.compile(r'[/"\']')
+
 def remove_comments(code: str) -> str:
     """
     Remove single-line and multi-line comments from C code.
+
+    The code is scanned once with a small state machine (code, line comment,
+    block comment, string literal, char literal), so comment markers inside
+    string and char literals are left untouched. Each block comment is
+    replaced by a space plus the newlines it contained, which keeps the
+    line structure of the code intact.
     
     Args:
         code (str): The input C code.
@@ -15,9 +24,41 @@ def remove_comments(code: str) -> str:
     Returns:
         str: The C code with comments removed.
     """
-    # Implementation to remove comments
-    # This is a placeholder and needs to be implemented
-    return code
+    out = []
+    n = len(code)
+    i = 0
+    while i < n:
+        # CODE state: jump straight to the next character that can change state
+        stop = _SCAN_STOP_RE.search(code, i)
+        if stop is None:
+            out.append(code[i:])
+            break
+        j = stop.start()
+        out.append(code[i:j])
+        ch = code[j]
+        nxt = code[j + 1] if j + 1 < n else ''
+        if ch == '/' and nxt == '/':
+            # LINE_COMMENT state: skip up to (but not including) the newline
+            end = code.find('\n', j + 2)
+            i = n if end == -1 else end
+        elif ch == '/' and nxt == '*':
+            # BLOCK_COMMENT state: skip up to and including the closing '*/'
+            end = code.find('*/', j + 2)
+            end = n if end == -1 else end + 2
+            out.append(' ' + '\n' * code.count('\n', j, end))
+            i = end
+        elif ch == '/':
+            out.append(ch)
+            i = j + 1
+        else:
+            # STRING / CHAR state: copy the literal verbatim, honouring escapes
+            k = j + 1
+            while k < n and code[k] != ch and code[k] != '\n':
+                k += 2 if code[k] == '\\' else 1
+            k = min(k + 1, n)
+            out.append(code[j:k])
+            i = k
+    return ''.join(out)
 
 def format_code(code: str) -> str:
     """
@@ -47,29 +88,63 @@ def analyze_code(code: str) -> dict:
     # This is a placeholder and needs to be implemented
     return {}
 
+import os
 import re
 import json
+from bisect import bisect_left
 from typing import Dict, Any, List
 
+_READ_BUFFER_SIZE = 1 << 17
+# Files larger than this are read in binary mode and decoded in one go
+_LARGE_FILE_SIZE = 16 << 20
+
+_FUNC_RE = re.compile(r'(\w+\s+)*\w+\s*\([^)]*\)\s*\{', re.MULTILINE)
+_STRUCT_INST_RE = re.compile(r'^\s*(\w+)\s+(\w+)\s*=\s*(\{[^}]+\});', re.MULTILINE)
+
+# One alternation over every element kind, so the source is scanned only once.
+# The group name of each alternative selects the CCodeParser._handle_<kind> method.
+_ELEMENT_PATTERNS = (
+    ('global', r'^\s*(?P<global_far>far\s+)?(?P<global_type>\w+)\s+(?P<global_name>\w+)'
+               r'(?P<global_size>\[\d+\])?\s*=\s*(?P<global_value>\{[^}]+\}|[^;]+);'),
+    ('extern', r'^extern\s+(?P<extern_type>\w+)\s+(?P<extern_name>\w+);'),
+    # [ \t] rather than \s: a valueless #define (e.g. an include guard) must not
+    # take the next line as its value, which would also hide that line from
+    # the other alternatives
+    ('macro', r'^#define[ \t]+(?P<macro_name>\w+)[ \t]+(?P<macro_value>[^\n]+)'),
+    ('struct', r'typedef\s+struct\s*\{(?P<struct_fields>[^}]*)\}\s*(?P<struct_name>\w+);'),
+)
+_ELEMENT_RE = re.compile('|'.join(f'(?P<{kind}>{pattern})' for kind, pattern in _ELEMENT_PATTERNS),
+                         re.MULTILINE)
+
 class CCodeParser:
     """
     A class for parsing C code files and extracting various elements.
     """
 
     def __init__(self):
+        # Extracted records are stored as tuples:
+        #   global_vars / struct_instances: (name, type, value)
+        #   extern_vars: (name, type)
+        #   macros: (name, value)
+        #   structs: (name, fields)
         self.content = ""
         self.global_vars = []
         self.extern_vars = []
         self.macros = []
         self.structs = []
         self.struct_instances = []
+        self._func_starts = []
+        self._func_ends = []
+        self._has_functions = False
 
-    def parse_file(self, file_path: str) -> str:
+    def parse_file(self, file_path: str, pretty: bool = False) -> str:
         """
         Parse a C file and extract global variables, extern variables, macros, and structs.
 
         Args:
             file_path (str): The path to the C file to be parsed.
+            pretty (bool): If True, indent the JSON output for human reading.
+                Defaults to False, which produces compact JSON.
 
         Returns:
             str: A JSON string containing the extracted information.
@@ -80,95 +155,111 @@ class CCodeParser:
             json.JSONEncodeError: If there's an error encoding the result to JSON.
         """
         self._read_file(file_path)
-        self._extract_global_variables()
-        self._extract_extern_variables()
-        self._extract_macros()
-        self._extract_structs()
-        self._extract_struct_instances()
-        return self._create_json_output()
+        self._build_function_ranges()
+        for match in _ELEMENT_RE.finditer(self.content):
+            if self._is_global_scope(match.start()):
+                getattr(self, f'_handle_{match.lastgroup}')(match)
+        return self._create_json_output(pretty)
 
     def _read_file(self, file_path: str):
-        """Read the content of the C file."""
-        with open(file_path, 'r', encoding='utf-8') as file:
-            self.content = file.read()
+        """Read the content of the C file, with comments removed."""
+        if os.path.getsize(file_path) > _LARGE_FILE_SIZE:
+            # Skip the text-mode newline translator; only normalise line
+            # endings when the file actually contains carriage returns.
+            with open(file_path, 'rb') as file:
+                content = file.read().decode('utf-8')
+            if '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
+        else:
+            with open(file_path, 'r', encoding='utf-8', buffering=_READ_BUFFER_SIZE) as file:
+                content = file.read()
+        self.content = remove_comments(content)
 
-    def _is_global_scope(self, match: re.Match) -> bool:
-        """Determine if a matched pattern is in the global scope of the C file."""
-        function_pattern = re.compile(r'(\w+\s+)*\w+\s*\([^)]*\)\s*\{', re.MULTILINE)
-        functions = list(function_pattern.finditer(self.content))
+    def _build_function_ranges(self):
+        """Compute the sorted (start, end) spans of function bodies in the C file."""
+        # Header-style files without any braces cannot contain function bodies
+        self._has_functions = '{' in self.content
+        if not self._has_functions:
+            self._func_starts = []
+            self._func_ends = []
+            return
 
-        for func in functions:
+        ranges = []
+        for func in _FUNC_RE.finditer(self.content):
             func_start = func.start()
             func_end = self.content.find('\n}', func_start)
             if func_end == -1:
                 func_end = len(self.content)
-            
-            if func_start < match.start() < func_end:
-                return False
-
-        return True
-
-    def _extract_global_variables(self):
-        """Extract global variables from the C code."""
-        pattern = re.compile(r'^\s*(far\s+)?(\w+)\s+(\w+)(\[\d+\])?\s*=\s*(\{[^}]+\}|[^;]+);', re.MULTILINE)
-        for match in pattern.finditer(self.content):
-            if self._is_global_scope(match):
-                far, var_type, name, array_size, value = match.groups()
-                if far:
-                    var_type = f"far {var_type}"
-                if array_size:
-                    name = f"{name}{array_size}"
-                self.global_vars.append({"name": name, "type": var_type, "value": value.strip()})
-
-    def _extract_extern_variables(self):
-        """Extract extern variables from the C code."""
-        pattern = re.compile(r'^extern\s+(\w+)\s+(\w+);', re.MULTILINE)
-        for match in pattern.finditer(self.content):
-            if self._is_global_scope(match):
-                var_type, name = match.groups()
-                self.extern_vars.append({"name": name, "type": var_type})
-
-    def _extract_macros(self):
-        """Extract macros from the C code."""
-        pattern = re.compile(r'^#define\s+(\w+)\s+(.+)', re.MULTILINE)
-        for match in pattern.finditer(self.content):
-            if self._is_global_scope(match):
-                name, value = match.groups()
-                value = re.sub(r'//.*$', '', value).strip()
-                self.macros.append({"name": name, "value": value})
-
-    def _extract_structs(self):
-        """Extract structs from the C code."""
-        pattern = re.compile(r'typedef\s+struct\s*\{([^}]*)\}\s*(\w+);', re.MULTILINE)
-        for match in pattern.finditer(self.content):
-            if self._is_global_scope(match):
-                fields, name = match.groups()
-                field_list = []
-                for field in fields.split(';'):
-                    field = field.strip()
-                    if field:
-                        field = re.sub(r'//.*', '', field).strip()
-                        field_list.append(field)
-                self.structs.append({"name": name, "fields": field_list})
-
-    def _extract_struct_instances(self):
-        """Extract struct instances from the C code."""
-        pattern = re.compile(r'^\s*(\w+)\s+(\w+)\s*=\s*(\{[^}]+\});', re.MULTILINE)
-        for match in pattern.finditer(self.content):
-            if self._is_global_scope(match):
-                struct_type, name, value = match.groups()
-                self.struct_instances.append({"name": name, "type": struct_type, "value": value.strip()})
-
-    def _create_json_output(self) -> str:
+            ranges.append((func_start, func_end))
+        ranges.sort()
+
+        # Keep a running maximum of the end positions so that a span nested in
+        # (or overlapping) an earlier one cannot hide the enclosing function.
+        self._func_starts = []
+        self._func_ends = []
+        max_end = -1
+        for func_start, func_end in ranges:
+            max_end = max(max_end, func_end)
+            self._func_starts.append(func_start)
+            self._func_ends.append(max_end)
+
+    def _is_global_scope(self, pos: int) -> bool:
+        """Determine if a position is in the global scope of the C file."""
+        if not self._has_functions:
+            return True
+        i = bisect_left(self._func_starts, pos) - 1
+        return i < 0 or pos >= self._func_ends[i]
+
+    def _handle_global(self, match: re.Match):
+        """Record a global variable, and the struct instance it may also be."""
+        far, var_type, name, array_size, value = match.group(
+            'global_far', 'global_type', 'global_name', 'global_size', 'global_value')
+        if far:
+            var_type = f"far {var_type}"
+        if array_size:
+            name = f"{name}{array_size}"
+        self.global_vars.append((name, var_type, value.strip()))
+
+        # Struct instances are global initialisations too, so they share the match
+        inst = _STRUCT_INST_RE.match(self.content, match.start())
+        if inst:
+            struct_type, inst_name, inst_value = inst.groups()
+            self.struct_instances.append((inst_name, struct_type, inst_value.strip()))
+
+    def _handle_extern(self, match: re.Match):
+        """Record an extern variable."""
+        var_type, name = match.group('extern_type', 'extern_name')
+        self.extern_vars.append((name, var_type))
+
+    def _handle_macro(self, match: re.Match):
+        """Record a macro."""
+        name, value = match.group('macro_name', 'macro_value')
+        self.macros.append((name, value.strip()))
+
+    def _handle_struct(self, match: re.Match):
+        """Record a struct definition."""
+        fields, name = match.group('struct_fields', 'struct_name')
+        field_list = []
+        for field in fields.split(';'):
+            field = field.strip()
+            if field:
+                field_list.append(field)
+        self.structs.append((name, field_list))
+
+    def _create_json_output(self, pretty: bool = False) -> str:
         """Create a JSON string from the extracted information."""
+        # Records are kept as plain tuples while parsing and only turned into
+        # dicts here, once per record, for serialisation.
         result = {
-            "global_variables": self.global_vars,
-            "extern_variables": self.extern_vars,
-            "macros": self.macros,
-            "structs": self.structs,
-            "struct_instances": self.struct_instances
+            "global_variables": [{"name": n, "type": t, "value": v} for n, t, v in self.global_vars],
+            "extern_variables": [{"name": n, "type": t} for n, t in self.extern_vars],
+            "macros": [{"name": n, "value": v} for n, v in self.macros],
+            "structs": [{"name": n, "fields": f} for n, f in self.structs],
+            "struct_instances": [{"name": n, "type": t, "value": v} for n, t, v in self.struct_instances]
         }
-        return json.dumps(result, indent=2, ensure_ascii=False)
+        if pretty:
+            return json.dumps(result, indent=2, ensure_ascii=False)
+        return json.dumps(result, ensure_ascii=False, separators=(',', ':'))
 
     # Placeholder methods for future implementations
     def extract_functions(self) -> List[Dict[str, Any]]:
@@ -190,7 +281,7 @@ class CCodeParser:
 if __name__ == "__main__":
     parser = CCodeParser()
     file_path = "PCC.c"  # Replace with your C file path
-    result_json = parser.parse_file(file_path)
+    result_json = parser.parse_file(file_path, pretty=True)
     with open('c_vars.json', 'w') as json_file:
         json_file.write(result_json)
     print("JSON data has been saved to c_vars.json")
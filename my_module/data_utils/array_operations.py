@@ -1,55 +1,133 @@
 import numpy as np
-from typing import List
+from typing import List, Optional
 
-def array_sum(arr):
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+def array_sum(arr, *, axis=None, dtype=None, out=None, keepdims=False):
     """
     计算数组元素的和
     
     :param arr: 输入数组
+    :param axis: 沿哪个轴计算，默认为None(对全部元素计算)
+    :param dtype: 累计使用的数据类型，默认为None(由NumPy决定)
+    :param out: 可选的预分配输出数组，循环中调用时可重复使用以避免分配
+    :param keepdims: 是否保留被归约的维度，默认为False
     :return: 数组元素的和
     """
-    return np.sum(arr)
+    return np.sum(arr, axis=axis, dtype=dtype, out=out, keepdims=keepdims)
 
-def array_product(arr):
+def array_product(arr, *, axis=None, dtype=None, out=None, keepdims=False):
     """
     计算数组元素的乘积
     
     :param arr: 输入数组
+    :param axis: 沿哪个轴计算，默认为None(对全部元素计算)
+    :param dtype: 累计使用的数据类型，默认为None(由NumPy决定)
+    :param out: 可选的预分配输出数组，循环中调用时可重复使用以避免分配
+    :param keepdims: 是否保留被归约的维度，默认为False
     :return: 数组元素的乘积
     """
-    return np.prod(arr)
+    return np.prod(arr, axis=axis, dtype=dtype, out=out, keepdims=keepdims)
 
-def array_mean(arr):
+def array_mean(arr, *, axis=None, dtype=None, out=None, keepdims=False):
     """
     计算数组元素的平均值
     
     :param arr: 输入数组
+    :param axis: 沿哪个轴计算，默认为None(对全部元素计算)
+    :param dtype: 累计使用的数据类型，默认为None(由NumPy决定)
+    :param out: 可选的预分配输出数组，循环中调用时可重复使用以避免分配
+    :param keepdims: 是否保留被归约的维度，默认为False
     :return: 数组元素的平均值
     """
-    return np.mean(arr)
+    return np.mean(arr, axis=axis, dtype=dtype, out=out, keepdims=keepdims)
 
-def array_max(arr):
+def array_max(arr, *, axis=None, out=None, keepdims=False):
     """
     找出数组中的最大值
     
     :param arr: 输入数组
+    :param axis: 沿哪个轴计算，默认为None(对全部元素计算)
+    :param out: 可选的预分配输出数组，循环中调用时可重复使用以避免分配
+    :param keepdims: 是否保留被归约的维度，默认为False
     :return: 数组中的最大值
     """
-    return np.max(arr)
+    return np.max(arr, axis=axis, out=out, keepdims=keepdims)
 
-def array_min(arr):
+def array_min(arr, *, axis=None, out=None, keepdims=False):
     """
     找出数组中的最小值
     
     :param arr: 输入数组
+    :param axis: 沿哪个轴计算，默认为None(对全部元素计算)
+    :param out: 可选的预分配输出数组，循环中调用时可重复使用以避免分配
+    :param keepdims: 是否保留被归约的维度，默认为False
     :return: 数组中的最小值
     """
-    return np.min(arr)
+    return np.min(arr, axis=axis, out=out, keepdims=keepdims)
+
+def _find_runs_numpy(array, lower_bound, upper_bound, mask_buf):
+    """
+    使用NumPy计算数组中落在[lower_bound, upper_bound]内的连续区间的起止索引
+
+    :param array: 一维输入数组
+    :param lower_bound: 下界(包含)
+    :param upper_bound: 上界(包含)
+    :param mask_buf: 长度为len(array) + 2的布尔缓冲区，内容会被覆盖
+    :return: (starts, ends) 两个索引数组
+    """
+    # The mask is written into the middle of the buffer and padded with False
+    # on both sides so that every run has both a rising and a falling edge.
+    mask_buf[0] = mask_buf[-1] = False
+    mask = mask_buf[1:-1]
+    np.greater_equal(array, lower_bound, out=mask)
+    # Only elements that passed the lower bound need the upper bound test
+    np.less_equal(array, upper_bound, out=mask, where=mask)
+
+    # The edges of the padded mask alternate start, end, start, end, ...
+    edges = np.flatnonzero(mask_buf[1:] != mask_buf[:-1])
+    return edges[0::2], edges[1::2]
+
+if njit is not None:
+    @njit(cache=True)
+    def _find_runs_jit(array, lower_bound, upper_bound):
+        """
+        单次遍历计算数组中落在[lower_bound, upper_bound]内的连续区间的起止索引
+
+        :param array: 一维浮点数组
+        :param lower_bound: 下界(包含)
+        :param upper_bound: 上界(包含)
+        :return: (starts, ends) 两个索引数组
+        """
+        n = array.shape[0]
+        starts = np.empty(n // 2 + 1, np.int64)
+        ends = np.empty(n // 2 + 1, np.int64)
+        count = 0
+        in_run = False
+        for i in range(n):
+            inside = array[i] >= lower_bound and array[i] <= upper_bound
+            if inside and not in_run:
+                starts[count] = i
+                in_run = True
+            elif not inside and in_run:
+                ends[count] = i
+                count += 1
+                in_run = False
+        if in_run:
+            ends[count] = n
+            count += 1
+        return starts[:count], ends[:count]
+else:
+    _find_runs_jit = None
 
 def extract_consecutive_elements_within_range(
     array: np.ndarray, 
     lower_bound: float, 
-    upper_bound: float
+    upper_bound: float,
+    mask_buf: Optional[np.ndarray] = None
 ) -> List[np.ndarray]:
     """
     Extracts consecutive subarrays from the input NumPy array where each element 
@@ -63,12 +141,24 @@ def extract_consecutive_elements_within_range(
         The lower bound of the range (inclusive).
     upper_bound : float
         The upper bound of the range (inclusive).
+    mask_buf : np.ndarray, optional
+        A preallocated boolean array of length ``len(array) + 2`` used as scratch
+        space for the padded mask. Passing the same buffer on repeated calls
+        (e.g. sliding windows over a long signal) avoids allocating a new mask
+        on every call. Its contents are overwritten.
+
+    Notes:
+    -----
+    When Numba is installed, 1-D float32/float64 arrays are scanned by a
+    compiled single-pass kernel instead of the NumPy mask pipeline (unless
+    `mask_buf` is given, in which case the buffer is filled as documented).
 
     Returns:
     -------
     List[np.ndarray]
         A list of NumPy subarrays, each containing a sequence of consecutive elements 
-        from the input array that are within the specified range.
+        from the input array that are within the specified range. The subarrays
+        are views into `array`, not copies.
 
     Raises:
     ------
@@ -76,7 +166,8 @@ def extract_consecutive_elements_within_range(
         If the input `array` is not a NumPy ndarray or if `lower_bound`/`upper_bound` 
         are not numerical (int or float) types.
     ValueError:
-        If `lower_bound` is greater than `upper_bound`.
+        If `lower_bound` is greater than `upper_bound`, or if `mask_buf` does not
+        have dtype bool and shape ``(len(array) + 2,)``.
 
     Example:
     -------
@@ -100,45 +191,33 @@ def extract_consecutive_elements_within_range(
     if lower_bound > upper_bound:
         raise ValueError(f"'lower_bound' ({lower_bound}) cannot be greater than 'upper_bound' ({upper_bound}).")
     
-    # ---------------------
-    # Step 1: Create a Boolean Mask
-    # ---------------------
-    mask = (array >= lower_bound) & (array <= upper_bound)
-    # Debug: Print the boolean mask
-    # print("Boolean Mask:", mask)
+    n = len(array)
+    if mask_buf is not None and (mask_buf.dtype != bool or mask_buf.shape != (n + 2,)):
+        raise ValueError(f"'mask_buf' must be a bool array of shape {(n + 2,)}, "
+                         f"got {mask_buf.dtype} array of shape {mask_buf.shape} instead.")
     
     # ---------------------
-    # Step 2: Identify Start and End Indices of Consecutive Sequences
+    # Step 1 & 2: Identify Start and End Indices of Consecutive Sequences
     # ---------------------
-    # Calculate the difference between consecutive elements in the mask
-    diff = np.diff(mask.astype(int))
-    # Debug: Print the difference array
-    # print("Difference:", diff)
-    
-    # Find indices where sequences start (transition from False to True)
-    starts = np.where(diff == 1)[0] + 1
-    # Find indices where sequences end (transition from True to False)
-    ends = np.where(diff == -1)[0] + 1
+    if (_find_runs_jit is not None and mask_buf is None and array.ndim == 1
+            and array.dtype in (np.float32, np.float64)):
+        # Cast the bounds to the array's dtype so float32 data is compared in
+        # float32, exactly like the NumPy path does
+        starts, ends = _find_runs_jit(array, array.dtype.type(lower_bound), array.dtype.type(upper_bound))
+    else:
+        if mask_buf is None:
+            mask_buf = np.empty(n + 2, dtype=bool)
+        starts, ends = _find_runs_numpy(array, lower_bound, upper_bound, mask_buf)
     
     # ---------------------
-    # Step 3: Handle Edge Cases
-    # ---------------------
-    # If the first element is within the range, prepend 0 to starts
-    if mask[0]:
-        starts = np.insert(starts, 0, 0)
-    
-    # If the last element is within the range, append the length of the array to ends
-    if mask[-1]:
-        ends = np.append(ends, len(mask))
-    
-    # ---------------------
-    # Step 4: Extract the Subarrays
+    # Step 3: Extract the Subarrays
     # ---------------------
+    # Slicing returns views into `array`, no data is copied
     subarrays = [array[start:end] for start, end in zip(starts, ends)]
     
     return subarrays
 
-def filter_values(x_data, y_data, threshold=50):
+def filter_values(x_data, y_data, threshold=50, stack=False):
     """
     功能说明:
     该函数用于筛选出在给定阈值下，y_data数组中绝对值大于阈值的对应x_data值。
@@ -147,9 +226,11 @@ def filter_values(x_data, y_data, threshold=50):
     - x_data: numpy array, 表示自变量数据
     - y_data: numpy array, 表示因变量数据
     - threshold: float, 可选，表示筛选的阈值，默认为50
+    - stack: bool, 可选，为True时返回(N, 2)的组合数组，默认为False
 
     返回值:
-    - numpy array, 返回满足条件的x_data和y_data值的组合数组
+    - tuple(numpy array, numpy array), 满足条件的x_data和y_data值
+    - 当stack=True时返回numpy array, 满足条件的x_data和y_data值的组合数组
 
     示例:
     ```python
@@ -157,16 +238,30 @@ def filter_values(x_data, y_data, threshold=50):
     x_data = np.array([1, 2, 3, 4, 5])
     y_data = np.array([10, 60, -70, 20, 30])
     
-    filtered_values = filter_values(x_data, y_data, threshold=50)
+    x_filtered, y_filtered = filter_values(x_data, y_data, threshold=50)
+    print(x_filtered, y_filtered)  # 输出: [2 3] [ 60 -70]
+
+    filtered_values = filter_values(x_data, y_data, threshold=50, stack=True)
     print(filtered_values)  # 输出: [[2 60] [3 -70]]
     ```
     """
 
     # 创建一个布尔掩码，筛选出绝对值大于阈值的y_data值
-    mask = np.abs(y_data) > threshold
+    # 分别与正负阈值比较并原地合并，避免生成完整的|y_data|中间数组
+    mask = np.greater(y_data, threshold)
+    np.logical_or(mask, np.less(y_data, -threshold), out=mask)
     
     # 使用掩码从x_data和y_data中提取对应的值
-    filtered_values = np.column_stack((x_data[mask], y_data[mask]))
+    x_filtered = x_data[mask]
+    y_filtered = y_data[mask]
+
+    if not stack:
+        return x_filtered, y_filtered
+
+    # 直接写入预分配的数组，避免column_stack的中间拼接
+    filtered_values = np.empty((len(x_filtered), 2), dtype=np.result_type(x_filtered, y_filtered))
+    filtered_values[:, 0] = x_filtered
+    filtered_values[:, 1] = y_filtered
     
     return filtered_values
 
@@ -1,5 +1,6 @@
 import math
-from scipy.signal import butter, filtfilt
+from functools import lru_cache
+from scipy.signal import butter, sosfiltfilt
 def add(a, b):
     """
     计算两个数的和
@@ -54,13 +55,31 @@ def power(base, exponent):
     return math.pow(base, exponent)
 
 # Apply a low-pass filter to further smooth the engine torque
+@lru_cache(maxsize=32)
 def butter_lowpass(cutoff, fs, order=5):
+    """
+    设计Butterworth低通滤波器
+
+    :param cutoff: 截止频率(Hz)
+    :param fs: 采样频率(Hz)
+    :param order: 滤波器阶数
+    :return: 二阶节(SOS)形式的滤波器系数，形状为(n_sections, 6)
+
+    结果按(cutoff, fs, order)缓存，返回的数组在多次调用间共享，调用方不应修改它。
+    """
     nyq = 0.5 * fs
     normal_cutoff = cutoff / nyq
-    b, a = butter(order, normal_cutoff, btype='low', analog=False)
-    return b, a
+    return butter(order, normal_cutoff, btype='low', analog=False, output='sos')
 
 def butter_lowpass_filter(data, cutoff, fs, order=5):
-    b, a = butter_lowpass(cutoff, fs, order=order)
-    y = filtfilt(b, a, data)
-    return y
+    """
+    对数据进行零相位Butterworth低通滤波
+
+    :param data: 输入数据
+    :param cutoff: 截止频率(Hz)
+    :param fs: 采样频率(Hz)
+    :param order: 滤波器阶数
+    :return: 滤波后的数据
+    """
+    sos = butter_lowpass(cutoff, fs, order=order)
+    return sosfiltfilt(sos, data)
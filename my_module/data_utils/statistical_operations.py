@@ -1,46 +1,95 @@
 import statistics
+import numpy as np
+
+def _as_numeric_array(data):
+    """
+    数值型NumPy数组或全部元素为float的列表/元组返回NumPy数组，其余输入返回None
+
+    整数列表、生成器、字符串、Fraction/Decimal等交给statistics模块处理，
+    以保持其原有的返回类型和行为
+
+    :param data: 输入数据
+    :return: NumPy数组或None
+    """
+    if isinstance(data, np.ndarray):
+        return data if data.dtype.kind in 'iuf' else None
+    if isinstance(data, (list, tuple)) and data and all(type(x) is float for x in data):
+        return np.asarray(data, dtype=np.float64)
+    return None
+
+def _check_size(a, min_size=1):
+    """
+    检查数组中的数据量
+
+    :param a: NumPy数组
+    :param min_size: 至少需要的数据个数
+    :return: 输入的数组
+    :raises statistics.StatisticsError: 当数据个数少于min_size时
+    """
+    if a.size < min_size:
+        raise statistics.StatisticsError(f"至少需要{min_size}个数据点")
+    return a
 
 def mean(data):
     """
     计算数据的平均值
-    
+
     :param data: 数值列表
     :return: 平均值
     """
-    return statistics.mean(data)
+    a = _as_numeric_array(data)
+    if a is None:
+        return statistics.mean(data)
+    return float(np.mean(_check_size(a)))
 
 def median(data):
     """
     计算数据的中位数
-    
+
     :param data: 数值列表
     :return: 中位数
     """
-    return statistics.median(data)
+    a = _as_numeric_array(data)
+    if a is None:
+        return statistics.median(data)
+    return float(np.median(_check_size(a)))
 
 def mode(data):
     """
     计算数据的众数
-    
+
     :param data: 数值列表
-    :return: 众数
+    :return: 众数，出现次数相同时返回最先出现的值
     """
-    return statistics.mode(data)
+    a = _as_numeric_array(data)
+    if a is None:
+        return statistics.mode(data)
+    a = _check_size(a).ravel()
+    _, first_index, counts = np.unique(a, return_index=True, return_counts=True)
+    # 与statistics.mode一致：多个众数时取在数据中最先出现的那个
+    candidates = np.flatnonzero(counts == counts.max())
+    return a[first_index[candidates].min()].item()
 
 def standard_deviation(data):
     """
     计算数据的标准差
-    
+
     :param data: 数值列表
     :return: 标准差
     """
-    return statistics.stdev(data)
+    a = _as_numeric_array(data)
+    if a is None:
+        return statistics.stdev(data)
+    return float(np.std(_check_size(a, min_size=2), ddof=1))
 
 def variance(data):
     """
     计算数据的方差
-    
+
     :param data: 数值列表
     :return: 方差
     """
-    return statistics.variance(data)
\ No newline at end of file
+    a = _as_numeric_array(data)
+    if a is None:
+        return statistics.variance(data)
+    return float(np.var(_check_size(a, min_size=2), ddof=1))
@@ -62,6 +62,36 @@ def list_to_csv(list_obj):
         return None
     
 import warnings
+from functools import lru_cache
+from types import MappingProxyType
+
+# C data type (lowercase) -> Simulink data type
+_TYPE_MAPPING = MappingProxyType({
+    "u8": "uint8",
+    "s8": "int8",
+    "u16": "uint16",
+    "s16": "int16",
+    "u32": "uint32",
+    "s32": "int32",
+    "u64": "uint64",
+    "s64": "int64",
+    "f32": "single",
+    "f64": "double",
+    "bool": "boolean",
+    "char": "int8",
+    "short": "int16",
+    "int": "int32",
+    "long": "int32",
+    "long long": "int64",
+    "float": "single",
+    "double": "double"
+})
+
+@lru_cache(maxsize=256)
+def _lookup_simulink_type(c_type: str):
+    """Look up the Simulink type for a C type string, or None if not recognized."""
+    # Strip any whitespace and convert to lowercase for case-insensitive matching
+    return _TYPE_MAPPING.get(c_type.strip().lower())
 
 def map_c_type_to_simulink(c_type: str) -> str:
     """
@@ -80,32 +110,10 @@ def map_c_type_to_simulink(c_type: str) -> str:
     if not isinstance(c_type, str):
         raise TypeError(f"Input must be a string, not {type(c_type)}")
 
-    type_mapping = {
-        "u8": "uint8",
-        "s8": "int8",
-        "u16": "uint16",
-        "s16": "int16",
-        "u32": "uint32",
-        "s32": "int32",
-        "u64": "uint64",
-        "s64": "int64",
-        "f32": "single",
-        "f64": "double",
-        "bool": "boolean",
-        "char": "int8",
-        "short": "int16",
-        "int": "int32",
-        "long": "int32",
-        "long long": "int64",
-        "float": "single",
-        "double": "double"
-    }
-    
-    # Strip any whitespace and convert to lowercase for case-insensitive matching
-    c_type_lower = c_type.strip().lower()
+    simulink_type = _lookup_simulink_type(c_type)
     
-    if c_type_lower not in type_mapping:
+    if simulink_type is None:
         warnings.warn(f"Unrecognized C type: {c_type}. Using original type.", UserWarning)
         return c_type
     
-    return type_mapping[c_type_lower]
\ No newline at end of file
+    return simulink_type
@@ -1,13 +1,235 @@
 """
 This module provides functionality for processing and manipulating MATLAB scripts.
 """
+import os
+import copy
 import matlab.engine
 import numpy as np
 import scipy.io
 import h5py
 import pickle
+from functools import lru_cache
 from typing import Dict, Any, Optional
 
+# v7.3 .mat(HDF5)文件的默认分块缓存设置: 128 MiB缓存，槽位数取质数以减少哈希冲突
+_RDCC_NBYTES = 128 * 1024 * 1024
+_RDCC_NSLOTS = 100003
+_RDCC_W0 = 0.75
+
+# HDF5文件签名
+_HDF5_SIGNATURE = b'\x89HDF\r\n\x1a\n'
+
+# MATLAB数组类型 -> NumPy数据类型
+_MATLAB_DTYPES = {
+    matlab.double: np.float64,
+    matlab.single: np.float32,
+    matlab.int8: np.int8,
+    matlab.int16: np.int16,
+    matlab.int32: np.int32,
+    matlab.int64: np.int64,
+    matlab.uint8: np.uint8,
+    matlab.uint16: np.uint16,
+    matlab.uint32: np.uint32,
+    matlab.uint64: np.uint64,
+    matlab.logical: np.bool_,
+}
+
+# MATLAB引擎直接以Python标量返回的类型
+_MATLAB_SCALAR_TYPES = (str, int, float)
+
+# save_matlab_workspace中用于一次性打包整个工作空间的临时变量名
+_WORKSPACE_STRUCT_NAME = 'py_workspace_snapshot__'
+
+def _matlab_array_to_numpy(matlab_var, dtype) -> np.ndarray:
+    """
+    功能说明:
+    将MATLAB数组转换为NumPy数组。如果MATLAB数组暴露了内部的`_data`缓冲区，
+    则直接按列优先(Fortran)顺序整体复制该缓冲区，避免逐元素转换；
+    否则退回到np.asarray。
+
+    参数:
+    - matlab_var: MATLAB数组对象(matlab.double等)
+    - dtype: 目标NumPy数据类型
+
+    返回值:
+    - np.ndarray: 转换后的NumPy数组(拥有独立内存)；复数数组返回复数类型(如complex128)
+    """
+    if getattr(matlab_var, '_is_complex', False):
+        # 复数数组不能按实数dtype转换，交给NumPy推断复数类型
+        return np.asarray(matlab_var)
+    data = getattr(matlab_var, '_data', None)
+    if data is not None:
+        try:
+            flat = np.frombuffer(data, dtype=dtype)
+        except (TypeError, ValueError):
+            flat = None
+        if flat is not None and flat.size == np.prod(matlab_var.size):
+            # MATLAB按列存储，先按Fortran顺序重排，再复制出独立的数组
+            return flat.reshape(matlab_var.size, order='F').copy()
+    try:
+        return np.asarray(matlab_var, dtype=dtype)
+    except TypeError:
+        # 未标记_is_complex的复数数组无法转换为实数dtype
+        return np.asarray(matlab_var)
+
+def _matlab_value_to_numpy(matlab_var) -> np.ndarray:
+    """
+    功能说明:
+    将从MATLAB引擎取回的值转换为NumPy数组。
+
+    参数:
+    - matlab_var: MATLAB数组对象或Python标量
+
+    返回值:
+    - np.ndarray: 转换后的NumPy数组
+    """
+    # 按类型查表，避免逐个isinstance判断
+    dtype = _MATLAB_DTYPES.get(type(matlab_var))
+    if dtype is not None:
+        return _matlab_array_to_numpy(matlab_var, dtype)
+    elif isinstance(matlab_var, _MATLAB_SCALAR_TYPES):
+        return np.array(matlab_var)
+    else:
+        raise ValueError(f"Unsupported MATLAB type: {type(matlab_var)}")
+
+def _todict(matobj: scipy.io.matlab.mat_struct) -> Dict[str, Any]:
+    """
+    功能说明:
+    将MATLAB结构转换为嵌套字典。使用显式栈代替递归，
+    深层嵌套的结构不会触发RecursionError。
+
+    参数:
+    - matobj: scipy.io.matlab.mat_struct, MATLAB结构对象
+
+    返回值:
+    - Dict[str, Any]: 转换后的嵌套字典
+    """
+    result = {}
+    stack = [(matobj, result)]
+    while stack:
+        obj, dest = stack.pop()
+        for fieldname in obj._fieldnames:
+            elem = getattr(obj, fieldname)
+            if isinstance(elem, scipy.io.matlab.mat_struct):
+                dest[fieldname] = {}
+                stack.append((elem, dest[fieldname]))
+            else:
+                dest[fieldname] = elem
+    return result
+
+def _check_keys(d: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    功能说明:
+    检查字典中的条目是否为mat对象。如果是，将它们转换为嵌套字典。
+
+    参数:
+    - d: Dict[str, Any], 要检查的字典
+
+    返回值:
+    - Dict[str, Any]: 处理后的字典
+    """
+    for key in d:
+        if isinstance(d[key], scipy.io.matlab.mat_struct):
+            d[key] = _todict(d[key])
+    return d
+
+def _is_hdf5_mat_file(filename: str) -> bool:
+    """
+    功能说明:
+    通过文件头判断.mat文件是否为v7.3(HDF5)格式。
+    MAT文件头的第124~125字节为版本号，v7.3为0x0200(v5为0x0100)；
+    不带MAT文件头的纯HDF5文件以HDF5签名开头。
+
+    参数:
+    - filename: str, .mat文件的路径
+
+    返回值:
+    - bool: 是v7.3(HDF5)格式时返回True
+    """
+    with open(filename, 'rb') as f:
+        header = f.read(128)
+    if header.startswith(_HDF5_SIGNATURE):
+        return True
+    return header.startswith(b'MATLAB') and header[124:126] in (b'\x00\x02', b'\x02\x00')
+
+def _read_hdf5_mat_file(filename: str, rdcc_nbytes: int = _RDCC_NBYTES,
+                        rdcc_nslots: int = _RDCC_NSLOTS, rdcc_w0: float = _RDCC_W0) -> Dict[str, Any]:
+    """
+    功能说明:
+    使用h5py读取v7.3(HDF5)格式的.mat文件。
+
+    参数:
+    - filename: str, .mat文件的路径
+    - rdcc_nbytes: int, HDF5分块缓存大小(字节)
+    - rdcc_nslots: int, HDF5分块缓存槽位数，建议取质数
+    - rdcc_w0: float, HDF5分块缓存淘汰策略参数(0~1)
+
+    返回值:
+    - Dict[str, Any]: 包含加载数据的字典
+    """
+    data = {}
+    with h5py.File(filename, 'r', rdcc_nbytes=rdcc_nbytes,
+                   rdcc_nslots=rdcc_nslots, rdcc_w0=rdcc_w0) as f:
+        def h5py_to_dict(obj):
+            if isinstance(obj, h5py.Dataset):
+                # 标量、空数据集和引用/对象类型无法直接读入预分配数组
+                if not obj.shape or obj.size == 0 or obj.dtype.hasobject:
+                    return obj[()]
+                # 预分配数组后整体读取，避免分块数据集逐块经过Python
+                buf = np.empty(obj.shape, dtype=obj.dtype)
+                obj.read_direct(buf)
+                return buf
+            elif isinstance(obj, h5py.Group):
+                return {key: h5py_to_dict(obj[key]) for key in obj.keys()}
+            else:
+                return obj
+        for key in f.keys():
+            data[key] = h5py_to_dict(f[key])
+    return data
+
+def _read_mat_file(filename: str, rdcc_nbytes: int = _RDCC_NBYTES,
+                   rdcc_nslots: int = _RDCC_NSLOTS, rdcc_w0: float = _RDCC_W0) -> Dict[str, Any]:
+    """
+    功能说明:
+    从磁盘读取并解析.mat文件，旧版本文件使用scipy读取，v7.3版本文件使用h5py读取。
+
+    参数:
+    - filename: str, .mat文件的路径
+    - rdcc_nbytes: int, v7.3文件的HDF5分块缓存大小(字节)
+    - rdcc_nslots: int, v7.3文件的HDF5分块缓存槽位数，建议取质数
+    - rdcc_w0: float, v7.3文件的HDF5分块缓存淘汰策略参数(0~1)
+
+    返回值:
+    - Dict[str, Any]: 包含加载数据的字典
+    """
+    # v7.3文件直接交给h5py，省去scipy先尝试按v5格式解析再失败的开销
+    if _is_hdf5_mat_file(filename):
+        return _read_hdf5_mat_file(filename, rdcc_nbytes, rdcc_nslots, rdcc_w0)
+    try:
+        data = scipy.io.loadmat(filename, struct_as_record=False, squeeze_me=True)
+        return _check_keys(data)
+    except NotImplementedError:
+        # 文件头未能识别的v7.3文件，scipy解析失败后再交给h5py
+        return _read_hdf5_mat_file(filename, rdcc_nbytes, rdcc_nslots, rdcc_w0)
+
+@lru_cache(maxsize=8)
+def _load_mat_file_cached(filename: str, mtime_ns: int, size: int,
+                          rdcc_nbytes: int, rdcc_nslots: int, rdcc_w0: float) -> Dict[str, Any]:
+    """
+    功能说明:
+    带缓存的.mat文件读取。mtime_ns和size只作为缓存键使用，文件被修改后会重新读取。
+
+    参数:
+    - filename: str, .mat文件的绝对路径
+    - mtime_ns: int, 文件修改时间(纳秒)
+    - size: int, 文件大小(字节)
+    - rdcc_nbytes, rdcc_nslots, rdcc_w0: HDF5分块缓存设置，见_read_mat_file
+
+    返回值:
+    - Dict[str, Any]: 包含加载数据的字典(缓存共享，不可修改)
+    """
+    return _read_mat_file(filename, rdcc_nbytes, rdcc_nslots, rdcc_w0)
+
 class MatlabInteractor:
     """
     功能说明:
@@ -120,88 +342,31 @@ class MatlabInteractor:
         if not self.eng:
             raise RuntimeError("MATLAB engine is not started. Call start_engine() first.")
 
-        matlab_var = self.eng.workspace[var_name]
-
-        if isinstance(matlab_var, matlab.double):
-            return np.array(matlab_var)
-        elif isinstance(matlab_var, matlab.single):
-            return np.array(matlab_var, dtype=np.float32)
-        elif isinstance(matlab_var, (matlab.int8, matlab.int16, matlab.int32, matlab.int64,
-                                     matlab.uint8, matlab.uint16, matlab.uint32, matlab.uint64)):
-            return np.array(matlab_var, dtype=np.dtype(matlab_var.__class__.__name__[6:]))
-        elif isinstance(matlab_var, matlab.logical):
-            return np.array(matlab_var, dtype=bool)
-        elif isinstance(matlab_var, str):
-            return np.array(matlab_var)
-        elif isinstance(matlab_var, (int, float)):
-            return np.array(matlab_var)
-        else:
-            raise ValueError(f"Unsupported MATLAB type: {type(matlab_var)}")
+        return _matlab_value_to_numpy(self.eng.workspace[var_name])
 
-    def load_mat_file(self, filename: str) -> Dict[str, Any]:
+    def load_mat_file(self, filename: str, rdcc_nbytes: int = _RDCC_NBYTES,
+                      rdcc_nslots: int = _RDCC_NSLOTS, rdcc_w0: float = _RDCC_W0) -> Dict[str, Any]:
         """
         功能说明:
         加载MATLAB .mat文件，处理旧版本和v7.3版本的文件，
         并将MATLAB结构转换为嵌套的Python字典。
 
+        解析结果按(文件路径, 修改时间, 文件大小)缓存，文件未变化时重复加载无需再次读取磁盘。
+        返回的是缓存结果的深拷贝，调用方可以自由修改。
+
         参数:
         - filename: str, .mat文件的路径
+        - rdcc_nbytes: int, 可选，v7.3文件的HDF5分块缓存大小(字节)，默认128 MiB
+        - rdcc_nslots: int, 可选，v7.3文件的HDF5分块缓存槽位数(建议取质数)，默认100003
+        - rdcc_w0: float, 可选，v7.3文件的HDF5分块缓存淘汰策略参数(0~1)，默认0.75
 
         返回值:
         - Dict[str, Any]: 包含加载数据的字典
         """
-        try:
-            data = scipy.io.loadmat(filename, struct_as_record=False, squeeze_me=True)
-            return self._check_keys(data)
-        except NotImplementedError:
-            data = {}
-            with h5py.File(filename, 'r') as f:
-                def h5py_to_dict(obj):
-                    if isinstance(obj, h5py.Dataset):
-                        return obj[()]
-                    elif isinstance(obj, h5py.Group):
-                        return {key: h5py_to_dict(obj[key]) for key in obj.keys()}
-                    else:
-                        return obj
-                for key in f.keys():
-                    data[key] = h5py_to_dict(f[key])
-            return data
-
-    def _check_keys(self, d: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        功能说明:
-        检查字典中的条目是否为mat对象。如果是，将它们转换为嵌套字典。
-
-        参数:
-        - d: Dict[str, Any], 要检查的字典
-
-        返回值:
-        - Dict[str, Any]: 处理后的字典
-        """
-        for key in d:
-            if isinstance(d[key], scipy.io.matlab.mat_struct):
-                d[key] = self._todict(d[key])
-        return d
-
-    def _todict(self, matobj: scipy.io.matlab.mat_struct) -> Dict[str, Any]:
-        """
-        功能说明:
-        递归地将MATLAB结构转换为嵌套字典。
-
-        参数:
-        - matobj: scipy.io.matlab.mat_struct, MATLAB结构对象
-
-        返回值:
-        - Dict[str, Any]: 转换后的嵌套字典
-        """
-        d = {}
-        for fieldname in matobj._fieldnames:
-            elem = getattr(matobj, fieldname)
-            if isinstance(elem, scipy.io.matlab.mat_struct):
-                d[fieldname] = self._todict(elem)
-            else:
-                d[fieldname] = elem
-        return d
+        st = os.stat(filename)
+        data = _load_mat_file_cached(os.path.abspath(filename), st.st_mtime_ns, st.st_size,
+                                     rdcc_nbytes, rdcc_nslots, rdcc_w0)
+        return copy.deepcopy(data)
 
     def save_matlab_workspace(self, save_path: Optional[str] = None) -> Dict[str, np.ndarray]:
         """
@@ -219,8 +384,25 @@ class MatlabInteractor:
 
         self.workspace = {}
         workspace_vars = self.eng.eval('who', nargout=1)
-        for var_name in workspace_vars:
-            self.workspace[var_name] = self.matlab_to_numpy(var_name)
+        if workspace_vars:
+            # 将所有变量打包进一个结构体，一次取回，避免每个变量一次往返通信。
+            # 每个值用{}包裹，保证cell变量不会把结构体展开成结构体数组。
+            fields = ','.join(f"'{var_name}',{{{var_name}}}" for var_name in workspace_vars)
+            try:
+                self.eng.eval(f"{_WORKSPACE_STRUCT_NAME} = struct({fields});", nargout=0)
+                snapshot = self.eng.workspace[_WORKSPACE_STRUCT_NAME]
+            except (matlab.engine.MatlabExecutionError, TypeError, ValueError):
+                # 工作空间中有引擎无法整体传回的类型时，退回到逐个变量读取
+                snapshot = None
+            finally:
+                self.eng.eval(f"clear {_WORKSPACE_STRUCT_NAME}", nargout=0)
+
+            if snapshot is not None:
+                for var_name in workspace_vars:
+                    self.workspace[var_name] = _matlab_value_to_numpy(snapshot[var_name])
+            else:
+                for var_name in workspace_vars:
+                    self.workspace[var_name] = self.matlab_to_numpy(var_name)
 
         if save_path:
             with open(save_path, 'wb') as f:
@@ -1,16 +1,65 @@
 import math
+import os
 import numpy as np
 import matplotlib.pyplot as plt
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(fastmath=True, parallel=True, cache=True)
+    def _resistance_force_kernel(speed_range, drag_k, grade_force, out):
+        """
+        单次遍历计算行驶阻力: out[i] = drag_k * v[i]^2 + grade_force
+
+        :param speed_range: 车速数组(m/s)
+        :param drag_k: 空气阻力常数 0.5 * Cd * A * rho
+        :param grade_force: 滚动阻力与坡度阻力之和 m * g * (Cr * cos(theta) + sin(theta))
+        :param out: 输出数组，行驶阻力(N)
+        """
+        for i in prange(speed_range.shape[0]):
+            v = speed_range[i]
+            out[i] = drag_k * v * v + grade_force
+
+    @njit(fastmath=True, parallel=True, cache=True)
+    def _resistance_and_driver_force_kernel(speed_range, drag_k, grade_force, inertia_force,
+                                            resistance_out, driver_out):
+        """
+        单次遍历同时计算行驶阻力与驱动力: driver_out[i] = inertia_force + resistance_out[i]
+
+        :param speed_range: 车速数组(m/s)
+        :param drag_k: 空气阻力常数 0.5 * Cd * A * rho
+        :param grade_force: 滚动阻力与坡度阻力之和 m * g * (Cr * cos(theta) + sin(theta))
+        :param inertia_force: 加速阻力 m * acceleration
+        :param resistance_out: 输出数组，行驶阻力(N)
+        :param driver_out: 输出数组，驱动力(N)
+        """
+        for i in prange(speed_range.shape[0]):
+            v = speed_range[i]
+            resistance = drag_k * v * v + grade_force
+            resistance_out[i] = resistance
+            driver_out[i] = inertia_force + resistance
+else:
+    _resistance_force_kernel = None
+    _resistance_and_driver_force_kernel = None
+
 def calculate_acceleration(vehicle_params, power, velocity):
     """
     计算车辆加速度
     :param vehicle_params: VehicleParameters对象
     :param power: 发动机功率(W)
-    :param velocity: 当前速度(m/s)
-    :return: 加速度(m/s^2)
+    :param velocity: 当前速度(m/s)，可以是标量或数组
+    :return: 加速度(m/s^2)；数组中速度为0的元素结果为inf(NumPy会给出RuntimeWarning)
+    :raises ZeroDivisionError: 标量速度为0时
     """
+    velocity = np.asarray(velocity)
+    # 与标量除法行为保持一致：标量速度为0时直接报错，而不是返回inf
+    if velocity.ndim == 0 and velocity == 0:
+        raise ZeroDivisionError("velocity must be non-zero")
     force = power / velocity
-    drag_force = 0.5 * 1.225 * vehicle_params.drag_coefficient * vehicle_params.frontal_area * velocity**2
+    drag_force = vehicle_params._drag_k * velocity**2
     acceleration = (force - drag_force) / vehicle_params.mass
     return acceleration
 
@@ -18,14 +67,16 @@ def calculate_power_required(vehicle_params, velocity):
     """
     计算维持给定速度所需的功率
     :param vehicle_params: VehicleParameters对象
-    :param velocity: 速度(m/s)
+    :param velocity: 速度(m/s)，可以是标量或数组
     :return: 所需功率(W)
     """
-    drag_force = 0.5 * 1.225 * vehicle_params.drag_coefficient * vehicle_params.frontal_area * velocity**2
+    velocity = np.asarray(velocity)
+    drag_force = vehicle_params._drag_k * velocity**2
     power_required = drag_force * velocity / vehicle_params.engine_efficiency
     return power_required
 
-def calculate_engine_speed_and_torque(velocity, drive_force, transmission_ratio, transmission_efficiency, wheel_radius):
+def calculate_engine_speed_and_torque(velocity, drive_force, transmission_ratio, transmission_efficiency, wheel_radius,
+                                      dtype=np.float64):
     """
     Calculate the engine speed in RPM (w_e) based on velocity, gear ratio, and wheel radius.
     
@@ -33,16 +84,20 @@ def calculate_engine_speed_and_torque(velocity, drive_force, transmission_ratio,
     velocity (float): Velocity in meters per second (m/s).
     gear_ratio (float): Gear ratio (dimensionless).
     wheel_radius (float): Wheel radius in meters.
+    dtype (numpy.dtype): Floating point type used for velocity and drive force sweeps.
+        Pass np.float32 to halve memory traffic on long sweeps. Defaults to np.float64.
 
     Returns:
     float: Engine speed in revolutions per minute (RPM).
     """
+    velocity = np.asarray(velocity, dtype=dtype)
+    drive_force = np.asarray(drive_force, dtype=dtype)
     TWO_PI = 2 * math.pi  # Constant for one full rotation in radians
     engine_speed = (velocity * transmission_ratio * 60) / (wheel_radius * TWO_PI)
     engine_torque = drive_force * wheel_radius / (transmission_ratio * transmission_efficiency)
     return engine_speed, engine_torque
 
-def calculate_resistance_force(speed_range, theta, m, Cd, A, rho, Cr, g):
+def calculate_resistance_force(speed_range, theta, m, Cd, A, rho, Cr, g, dtype=np.float64):
     """
     Calculate the resistance forces in different speed ranges.
     
@@ -54,15 +109,30 @@ def calculate_resistance_force(speed_range, theta, m, Cd, A, rho, Cr, g):
     Cr (float): Rolling resistance coefficient.
     g (float): Gravitational acceleration in m/s^2.
     theta (float): Slope in radians.
+    dtype (numpy.dtype): Floating point type of the speed sweep and the result.
+        Pass np.float32 to halve memory traffic on long sweeps. Defaults to np.float64.
 
     Returns:
     numpy.ndarray: Array of resistance forces in N.
     """
+    speed_range = np.asarray(speed_range, dtype=dtype)
+
+    # With a constant slope the rolling and grade terms are one scalar, so the
+    # whole sweep can be computed in a single fused pass
+    if (_resistance_force_kernel is not None and np.ndim(theta) == 0
+            and speed_range.ndim == 1):
+        resistance_force = np.empty_like(speed_range)
+        grade_force = m * g * (Cr * math.cos(theta) + math.sin(theta))
+        _resistance_force_kernel(speed_range, 0.5 * Cd * A * rho, grade_force, resistance_force)
+        return resistance_force
+
     resistance_force = 0.5 * Cd * A * rho * speed_range**2 + m * g * Cr * np.cos(theta) + m * g * np.sin(theta)
     
-    return resistance_force
+    # An array theta (float64) promotes the expression, return the requested dtype like the kernel does
+    return resistance_force.astype(dtype, copy=False)
 
-def calculate_resistance_and_driver_force(speed_range, theta, acceleration):
+def calculate_resistance_and_driver_force(speed_range, theta, acceleration, m, Cd, A, rho, Cr, g,
+                                          dtype=np.float64):
     """
     Calculate the resistance and driver forces in different speed ranges.
     
@@ -70,16 +140,60 @@ def calculate_resistance_and_driver_force(speed_range, theta, acceleration):
     speed_range (numpy.ndarray): Array of speeds in m/s.
     theta (float): Slope in radians.
     acceleration (float): Acceleration in m/s^2.
+    m (float): Vehicle mass in kg.
+    Cd (float): Aerodynamic drag coefficient.
+    A (float): Frontal area in m^2.
+    rho (float): Air density in kg/m^3.
+    Cr (float): Rolling resistance coefficient.
+    g (float): Gravitational acceleration in m/s^2.
+    dtype (numpy.dtype): Floating point type of the speed sweep and the results.
+        Defaults to np.float64.
 
     Returns:
     numpy.ndarray: Array of resistance forces in N.
     numpy.ndarray: Array of driver forces in N.
     """
-    resistance_force = calculate_resistance_force(speed_range, theta)
-    driver_force = m * acceleration + resistance_force   
-    return resistance_force, driver_force
+    speed_range = np.asarray(speed_range, dtype=dtype)
+
+    # With a constant slope and acceleration both forces come out of one fused pass
+    if (_resistance_and_driver_force_kernel is not None and np.ndim(theta) == 0
+            and np.ndim(acceleration) == 0 and speed_range.ndim == 1):
+        resistance_force = np.empty_like(speed_range)
+        driver_force = np.empty_like(speed_range)
+        grade_force = m * g * (Cr * math.cos(theta) + math.sin(theta))
+        _resistance_and_driver_force_kernel(speed_range, 0.5 * Cd * A * rho, grade_force,
+                                            m * acceleration, resistance_force, driver_force)
+        return resistance_force, driver_force
+
+    resistance_force = calculate_resistance_force(speed_range, theta, m, Cd, A, rho, Cr, g, dtype=dtype)
+    driver_force = m * acceleration + resistance_force
+    return resistance_force, driver_force.astype(dtype, copy=False)
+
+def plot_theta_and_engine_data(theta_degrees, engine_torque_array, speed_array, show=False, savefig=None,
+                               dpi=150):
+    """
+    Plot the slope and the engine torque/speed traces on two separate figures.
+
+    Args:
+    theta_degrees (numpy.ndarray): Slope values.
+    engine_torque_array (numpy.ndarray): Engine torque values.
+    speed_array (numpy.ndarray): Vehicle speed values in m/s.
+    show (bool): If True, display the figures with plt.show(). Defaults to False.
+    savefig (tuple of str): Optional pair of file paths for the slope figure and the
+        torque/speed figure. When given, both figures are saved and closed.
+    dpi (int): Resolution of the saved figures. Defaults to 150.
+
+    Returns:
+    tuple: (fig1, fig2), the slope figure and the torque/speed figure.
+
+    Raises:
+    ValueError: If savefig is not a sequence of exactly two file paths.
+    """
+    # A single path would otherwise be iterated character by character
+    if savefig is not None:
+        if isinstance(savefig, (str, bytes, os.PathLike)) or len(savefig) != 2:
+            raise ValueError(f"'savefig' must be a pair of file paths, got {savefig!r} instead.")
 
-def plot_theta_and_engine_data(theta_degrees, engine_torque_array, speed_array):
     # Create two separate figures
     fig1, ax1 = plt.subplots(figsize=(12, 6))
     fig2, ax2 = plt.subplots(figsize=(12, 6))
@@ -112,5 +226,14 @@ def plot_theta_and_engine_data(theta_degrees, engine_torque_array, speed_array):
 
     ax2.set_title('Engine Torque and Speed vs Data Points')
 
-    plt.tight_layout()
-    plt.show()
+    fig1.tight_layout()
+    fig2.tight_layout()
+
+    if savefig is not None:
+        for fig, path in zip((fig1, fig2), savefig):
+            fig.savefig(path, dpi=dpi)
+            plt.close(fig)
+    elif show:
+        plt.show()
+
+    return fig1, fig2
@@ -1,5 +1,12 @@
 import numpy as np
-from scipy.interpolate import interp1d, RegularGridInterpolator
+from functools import lru_cache
+from scipy.interpolate import RegularGridInterpolator
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 def calculate_fuel_consumption(vehicle_params, power, velocity, fuel_energy_density):
     """
     计算燃料消耗率
@@ -29,7 +36,7 @@ def calculate_range(vehicle_params, fuel_capacity, velocity, fuel_energy_density
     range_km = fuel_capacity / (fuel_consumption / 100)
     return range_km
 
-def plot_engine_characteristics_interactive(engine_map, actual_engine_rpm, actual_engine_torque, **kwargs):
+def plot_engine_characteristics_interactive(engine_map, actual_engine_rpm, actual_engine_torque, show=False, **kwargs):
     """
     Create an interactive plot of engine universal characteristic curves using Plotly.
     
@@ -37,13 +44,15 @@ def plot_engine_characteristics_interactive(engine_map, actual_engine_rpm, actua
     - engine_map: Dictionary containing engine map data
     - actual_engine_rpm: Array of actual engine RPM values
     - actual_engine_torque: Array of actual engine torque values
+    - show: If True, also display the figure with fig.show() (default: False)
     - **kwargs: Dictionary containing optional plot parameters
         - 'title': Title of the plot (default: 'Engine Universal Characteristic Curves')
         - 'width': Width of the figure in pixels (default: 1200)
         - 'height': Height of the figure in pixels (default: 800)
     
     Returns:
-    None: Displays the plot using Plotly
+    plotly.graph_objects.Figure: The figure; callers decide whether to show it,
+    export it with fig.to_html() or write it with fig.write_image()
     """
     import plotly.graph_objects as go
 
@@ -164,14 +173,77 @@ def plot_engine_characteristics_interactive(engine_map, actual_engine_rpm, actua
         legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01)
     )
 
-    fig.show()
+    if show:
+        fig.show()
+
+    return fig
 
 # Usage example:
-# plot_engine_characteristics_interactive(engine_map, actual_engine_rpm, actual_engine_torque, title="Custom Title", width=1000, height=800)
+# fig = plot_engine_characteristics_interactive(engine_map, actual_engine_rpm, actual_engine_torque, title="Custom Title", width=1000, height=800)
+# fig.show()
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _fuel_gps_kernel(fc_radps, fc_Nm_all, fc_Nm_fr, temp_gpkwh,
+                         rpm_idle_min, rpm_idle_max, nm_idle_max, idle_gps, out):
+        """
+        单次遍历完成f_fuel_gps_map中插值之后的全部逐点计算
+        (净扭矩、油耗、怠速判断和非正扭矩/转速置零)，不产生中间数组
+
+        :param fc_radps: 发动机转速(rad/s)
+        :param fc_Nm_all: 总扭矩(Nm)
+        :param fc_Nm_fr: 摩擦扭矩(Nm)
+        :param temp_gpkwh: 插值得到的比油耗(g/kWh)
+        :param rpm_idle_min: 怠速转速下限(RPM)
+        :param rpm_idle_max: 怠速转速上限(RPM)
+        :param nm_idle_max: 怠速扭矩上限(Nm)
+        :param idle_gps: 怠速油耗(g/s)
+        :param out: 输出数组，瞬时油耗(g/s)
+        """
+        for i in prange(out.shape[0]):
+            radps = fc_radps[i]
+            if fc_Nm_all[i] <= 0 or radps <= 0:
+                out[i] = 0.0
+                continue
+            nm = max(fc_Nm_all[i] - fc_Nm_fr[i], 0.0)
+            rpm = radps * (30 / np.pi)
+            if rpm > rpm_idle_min and rpm < rpm_idle_max and nm < nm_idle_max:
+                out[i] = idle_gps
+            else:
+                out[i] = nm * radps * temp_gpkwh[i] / (1000 * 3600)
+else:
+    _fuel_gps_kernel = None
+
+@lru_cache(maxsize=8)
+def _gpkwh_interpolator(rpm_key, nm_key, gpkwh_key, gpkwh_shape, dtype):
+    """
+    构建(并缓存)油耗MAP的二维插值器
+
+    参数以bytes形式传入，使得相同的MAP数据命中同一个缓存项，
+    在仿真循环中重复调用f_fuel_gps_map时无需重复构建插值器。
 
+    :param rpm_key: fc_map_rpm(float64)的字节内容
+    :param nm_key: fc_map_nm(float64)的字节内容
+    :param gpkwh_key: 原始fc_map_gpkwh(float64, 形状为(nm, rpm))的字节内容
+    :param gpkwh_shape: 原始fc_map_gpkwh的形状
+    :param dtype: 插值器使用的浮点类型(dtype字符串)
+    :return: RegularGridInterpolator
+    """
+    # frombuffer gives read-only views, copy so the interpolator works on owned arrays
+    fc_map_rpm = np.frombuffer(rpm_key).copy()
+    fc_map_nm = np.frombuffer(nm_key).copy()
+    # Transpose to (rpm, nm) only here, once per map, into a C-contiguous grid
+    fc_map_gpkwh = np.ascontiguousarray(np.frombuffer(gpkwh_key).reshape(gpkwh_shape).T, dtype=dtype)
+    return RegularGridInterpolator(
+        (fc_map_rpm, fc_map_nm),
+        fc_map_gpkwh,
+        bounds_error=False,
+        fill_value=0
+    )
 
 def f_fuel_gps_map(fc_map_rpm, fc_map_nm, fc_map_maxNm, fc_map_gpkwh,
-                  fc_radps, fc_Nm_all, fc_Nm_fr, fc_radps_idle, fc_idle_gps):
+                  fc_radps, fc_Nm_all, fc_Nm_fr, fc_radps_idle, fc_idle_gps, dtype=np.float64):
     """
     功能：查表计算发动机瞬时能耗 (Lookup table to calculate instantaneous engine fuel consumption)
 
@@ -185,80 +257,102 @@ def f_fuel_gps_map(fc_map_rpm, fc_map_nm, fc_map_maxNm, fc_map_gpkwh,
         fc_Nm_fr (np.ndarray): Friction torque (Nm)
         fc_radps_idle (np.ndarray): Idle engine speed in rad/s
         fc_idle_gps (np.ndarray): Idle fuel consumption (g/s)
+        dtype (np.dtype): 逐点计算使用的浮点类型，默认np.float64；长序列可传np.float32以减半内存带宽
 
     返回:
         np.ndarray: Fuel consumption map (fuel_gps_map)
     """
     # Ensure inputs are numpy arrays
-    fc_map_rpm = np.asarray(fc_map_rpm)
-    fc_map_nm = np.asarray(fc_map_nm)
+    fc_map_rpm = np.asarray(fc_map_rpm, dtype=np.float64)
+    fc_map_nm = np.asarray(fc_map_nm, dtype=np.float64)
     fc_map_maxNm = np.asarray(fc_map_maxNm)
-    fc_map_gpkwh = np.asarray(fc_map_gpkwh).T
-    fc_radps = np.asarray(fc_radps)
-    fc_Nm_all = np.asarray(fc_Nm_all)
-    fc_Nm_fr = np.asarray(fc_Nm_fr)
+    fc_map_gpkwh = np.asarray(fc_map_gpkwh, dtype=np.float64)
+    # Scalars are promoted to 1-element arrays (the result then has shape (1,)), and
+    # the operating points are broadcast to one shape so the in-place steps below
+    # always have a real output array of the final shape
+    fc_radps = np.atleast_1d(np.asarray(fc_radps, dtype=dtype))
+    fc_Nm_all = np.atleast_1d(np.asarray(fc_Nm_all, dtype=dtype))
+    fc_Nm_fr = np.atleast_1d(np.asarray(fc_Nm_fr, dtype=dtype))
+    if not fc_radps.shape == fc_Nm_all.shape == fc_Nm_fr.shape:
+        shape = np.broadcast_shapes(fc_radps.shape, fc_Nm_all.shape, fc_Nm_fr.shape)
+        fc_radps = np.broadcast_to(fc_radps, shape)
+        fc_Nm_all = np.broadcast_to(fc_Nm_all, shape)
+        fc_Nm_fr = np.broadcast_to(fc_Nm_fr, shape)
     fc_radps_idle = np.asarray(fc_radps_idle)
     fc_idle_gps = np.asarray(fc_idle_gps)
 
-    # Convert rad/s to RPM
-    temp_rpm = fc_radps * 30 / np.pi
-
-    # Clamp temp_rpm within fc_map_rpm range
-    temp_rpm = np.clip(temp_rpm, np.min(fc_map_rpm), np.max(fc_map_rpm))
+    # Convert rad/s to RPM and calculate net torque (computed once, reused below)
+    engine_rpm = fc_radps * (30 / np.pi)
+    net_nm = fc_Nm_all - fc_Nm_fr
 
-    # Calculate net torque
-    temp_nm = fc_Nm_all - fc_Nm_fr
+    # Clamp rpm and torque within the map range for the lookup
+    temp_rpm = np.clip(engine_rpm, np.min(fc_map_rpm), np.max(fc_map_rpm))
+    temp_nm = np.clip(net_nm, np.min(fc_map_nm), np.max(fc_map_nm))
 
-    # Clamp temp_nm within fc_map_nm range
-    temp_nm = np.clip(temp_nm, np.min(fc_map_nm), np.max(fc_map_nm))
-
-    # Interpolate max torque for temp_rpm using interp1d
-    interp_maxNm_func = interp1d(fc_map_rpm, fc_map_maxNm, kind='linear', fill_value="extrapolate")
-    temp_nm_max = interp_maxNm_func(temp_rpm) * 0.95  # Scale down by 0.95
+    # Interpolate max torque for temp_rpm; temp_rpm is already clipped to the
+    # map range, so no extrapolation is needed
+    temp_nm_max = np.interp(temp_rpm, fc_map_rpm, fc_map_maxNm) * 0.95  # Scale down by 0.95
 
     # Ensure temp_nm does not exceed temp_nm_max
-    temp_nm = np.minimum(temp_nm, temp_nm_max)
+    np.minimum(temp_nm, temp_nm_max, out=temp_nm)
 
-    # Create 2D interpolation function for fc_map_gpkwh using RegularGridInterpolator
-    interp_gpkwh_func = RegularGridInterpolator(
-        (fc_map_rpm, fc_map_nm),
-        fc_map_gpkwh,
-        bounds_error=False,
-        fill_value=0
-    )
+    # 2D interpolation function for fc_map_gpkwh, reused while the map is unchanged
+    interp_gpkwh_func = _gpkwh_interpolator(
+        fc_map_rpm.tobytes(), fc_map_nm.tobytes(), fc_map_gpkwh.tobytes(), fc_map_gpkwh.shape,
+        np.dtype(dtype).str)
 
-    # Prepare points for interpolation
-    points = np.array([temp_rpm, temp_nm]).T  # Shape (N, 2)
+    # Prepare points for interpolation, shape (N, 2). The buffer is filled as
+    # (2, N) and transposed (a view), which is the layout the interpolator
+    # walks fastest.
+    points = np.empty((2, temp_rpm.size), dtype=dtype)
+    points[0] = temp_rpm.ravel()
+    points[1] = temp_nm.ravel()
+    points = points.T
 
     # Interpolate gpkwh for temp_rpm and temp_nm
-    temp_gpkwh = interp_gpkwh_func(points)
-    temp_gpkwh = np.nan_to_num(temp_gpkwh, nan=0.0)
-
-    # Recalculate temp_rpm and temp_nm after initial adjustments
-    temp_rpm = fc_radps * 30 / np.pi
-    temp_nm = fc_Nm_all - fc_Nm_fr
-    temp_nm = np.maximum(temp_nm, 0)  # Net torque cannot be negative
-
-    # Calculate fuel_gps_map
-    fuel_gps_map = (temp_nm * temp_rpm * np.pi / 30) / (1000 * 3600) * temp_gpkwh
+    temp_gpkwh = interp_gpkwh_func(points).reshape(temp_rpm.shape)
+    np.nan_to_num(temp_gpkwh, copy=False, nan=0.0)
 
     # Idle fuel consumption special handling
-    fc_rpm_idle_max = fc_radps_idle * 30 / np.pi + 10  # RPM
-    fc_rpm_idle_min = fc_radps_idle * 30 / np.pi - 50  # RPM
+    fc_rpm_idle = fc_radps_idle * (30 / np.pi)
+    fc_rpm_idle_max = fc_rpm_idle + 10  # RPM
+    fc_rpm_idle_min = fc_rpm_idle - 50  # RPM
     fc_nm_idle_max = np.max(fc_map_maxNm) * 0.1  # 10% of max torque
 
+    # With Numba, fuse the remaining per-point steps into one pass
+    if (_fuel_gps_kernel is not None and fc_radps.ndim == 1
+            and fc_radps.shape == fc_Nm_all.shape == fc_Nm_fr.shape
+            and fc_radps_idle.size == 1 and fc_idle_gps.size == 1):
+        fuel_gps_map = np.empty(fc_radps.shape, dtype=dtype)
+        _fuel_gps_kernel(fc_radps, fc_Nm_all, fc_Nm_fr, temp_gpkwh,
+                         float(fc_rpm_idle_min.flat[0]), float(fc_rpm_idle_max.flat[0]),
+                         float(fc_nm_idle_max), float(fc_idle_gps.flat[0]), fuel_gps_map)
+        return fuel_gps_map
+
+    # Net torque cannot be negative
+    net_nm_pos = np.maximum(net_nm, 0)
+
     # Create boolean mask for idle conditions
     idle_mask = (
-        (temp_rpm > fc_rpm_idle_min) &
-        (temp_rpm < fc_rpm_idle_max) &
-        (temp_nm < fc_nm_idle_max)
+        (engine_rpm > fc_rpm_idle_min) &
+        (engine_rpm < fc_rpm_idle_max) &
+        (net_nm_pos < fc_nm_idle_max)
     )
 
+    # Calculate fuel_gps_map in place (temp_rpm * pi / 30 is fc_radps again)
+    fuel_gps_map = net_nm_pos
+    np.multiply(fuel_gps_map, fc_radps, out=fuel_gps_map)
+    np.multiply(fuel_gps_map, temp_gpkwh, out=fuel_gps_map)
+    np.divide(fuel_gps_map, 1000 * 3600, out=fuel_gps_map)
+
     # Apply idle fuel consumption
     fuel_gps_map[idle_mask] = fc_idle_gps
 
-    # Set fuel consumption to 0 where total torque or engine speed is 0 or negative
-    fuel_gps_map = np.where((fc_Nm_all <= 0) | (fc_radps <= 0), 0, fuel_gps_map)
+    # Set fuel consumption to 0 where total torque or engine speed is 0 or negative,
+    # reusing idle_mask as scratch space instead of building a new result array
+    off_mask = np.less_equal(fc_Nm_all, 0, out=idle_mask)
+    off_mask |= fc_radps <= 0
+    fuel_gps_map[off_mask] = 0
 
     return fuel_gps_map
 
@@ -1,9 +1,17 @@
+from dataclasses import dataclass, field
+
+@dataclass(frozen=True, slots=True)
 class VehicleParameters:
-    def __init__(self, mass, drag_coefficient, frontal_area, engine_efficiency):
-        self.mass = mass  # 车辆质量(kg)
-        self.drag_coefficient = drag_coefficient  # 空气阻力系数
-        self.frontal_area = frontal_area  # 车辆前面积(m^2)
-        self.engine_efficiency = engine_efficiency  # 发动机效率
+    mass: float  # 车辆质量(kg)
+    drag_coefficient: float  # 空气阻力系数
+    frontal_area: float  # 车辆前面积(m^2)
+    engine_efficiency: float  # 发动机效率
+    # 空气阻力常数 0.5 * rho * Cd * A，空气阻力 = _drag_k * v^2
+    _drag_k: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # 实例不可变，因此阻力常数只需在创建时计算一次
+        object.__setattr__(self, '_drag_k', 0.5 * 1.225 * self.drag_coefficient * self.frontal_area)
 
 def convert_kw_to_hp(power_kw):
     """
@@ -1,13 +1,211 @@
+from functools import lru_cache
+from itertools import cycle, islice, repeat
 import plotly.graph_objects as go
 import numpy as np
 import matplotlib.pyplot as plt
-def plot2d_interactive_multi_axis(data, scale_factors=None, **kwargs):
+
+# Traces with more points than this are drawn with WebGL (Scattergl) instead of SVG
+_WEBGL_THRESHOLD = 5000
+
+# Default trace colors of the multi-axis plots, repeated when there are more datasets
+_BASE_COLORS = ('blue', 'red', 'green', 'purple', 'orange')
+
+# Grid shown on every axis of the multi-axis plots
+_AXIS_GRID = {'showgrid': True, 'gridwidth': 1, 'gridcolor': 'LightGray'}
+
+# Properties shared by every additional y-axis of the multi-axis plots
+_YAXIS_TEMPLATE = {'overlaying': 'y', 'anchor': 'free', **_AXIS_GRID}
+
+# Default line styles and markers of plot_2d, repeated when there are more datasets
+_LINE_STYLES = ('-', '--', '-.', ':')
+_MARKERS = ('o', 's', '^', 'D', 'v', '*', 'p', 'h')
+
+def _minmax_decimation_indices(y, max_points):
+    """
+    Select the samples of a long trace to keep with min/max bucket decimation.
+
+    The samples are split into equal buckets and only the minimum and maximum of
+    each bucket are kept, in their original order, so peaks and the visible line
+    shape survive the reduction.
+
+    Parameters:
+    - y: 1D numpy array of y values
+    - max_points: maximum number of points to keep, None disables decimation
+
+    Returns:
+    - Sorted index array into y, or None if y is short enough to plot as is
+    """
+    n = y.size
+    if max_points is None or n <= max_points:
+        return None
+
+    n_buckets = max(1, max_points // 2)
+    stride = -(-n // n_buckets)  # ceil(n / n_buckets)
+    full = n - n % stride
+
+    # Reshape-based bucketing: one row per bucket, the tail is handled on its own
+    buckets = y[:full].reshape(-1, stride)
+    offsets = np.arange(0, full, stride)
+    i_min = buckets.argmin(axis=1) + offsets
+    i_max = buckets.argmax(axis=1) + offsets
+    if full < n:
+        tail = y[full:]
+        i_min = np.append(i_min, tail.argmin() + full)
+        i_max = np.append(i_max, tail.argmax() + full)
+
+    # Interleave per bucket so that the indices stay in original order
+    indices = np.empty(2 * i_min.size, dtype=np.intp)
+    np.minimum(i_min, i_max, out=indices[0::2])
+    np.maximum(i_min, i_max, out=indices[1::2])
+    return indices
+
+def _index_axis(n):
+    """
+    Build the 1-based sample index used as x-axis for 1D datasets.
+
+    float32 halves the bytes sent to the browser and represents every index
+    exactly up to 2**24, longer axes stay float64.
+    """
+    dtype = np.float32 if n <= 1 << 24 else np.float64
+    return np.arange(1, n + 1, dtype=dtype)
+
+def _scale_for_plot(y, scale_factor, owned=False):
+    """
+    Scale a dataset for plotting, narrowing float64 data to float32.
+
+    Plotly sends the numbers to the browser as JSON anyway, so float32 halves
+    the payload without a visible difference on screen. A scale factor of 1
+    skips the multiplication, and arrays owned by the caller (e.g. the copy
+    made by decimation) are scaled in place instead of into a new array.
+    scale_factor may also be an array that broadcasts against y.
+    """
+    if y.dtype == np.float64 and np.all(np.isfinite(scale_factor)):
+        if np.all(scale_factor == 1):
+            return y.astype(np.float32)
+        return np.multiply(y, scale_factor, dtype=np.float32)
+    if np.all(scale_factor == 1):
+        return y
+    if owned and np.can_cast(np.result_type(y, scale_factor), y.dtype, casting='same_kind'):
+        return np.multiply(y, scale_factor, out=y)
+    return y * scale_factor
+
+def _stacked_xy(x_data, y_arrays, scale_factors, max_points):
+    """
+    Decimate and scale equal-length datasets together as one (k, m) block.
+
+    The samples kept for every dataset are written into a single contiguous
+    block (float64 data is narrowed to float32 on the way in), and all rows
+    are scaled with one broadcasted multiply instead of one per dataset.
+
+    Parameters:
+    - x_data: 1D numpy array for x-axis data
+    - y_arrays: list of k 1D numpy arrays of the same length
+    - scale_factors: list of k scale factors, or None
+    - max_points: maximum number of points to keep per dataset, None keeps all
+
+    Returns:
+    - list of (x, y) pairs, one per dataset
+    """
+    all_indices = [_minmax_decimation_indices(y, max_points) for y in y_arrays]
+    # The number of decimated samples only depends on the length, so it is the same for every row
+    m = y_arrays[0].size if all_indices[0] is None else all_indices[0].size
+    dtype = np.result_type(*y_arrays)
+    block = np.empty((len(y_arrays), m), dtype=np.float32 if dtype == np.float64 else dtype)
+    for row, y, indices in zip(block, y_arrays, all_indices):
+        row[...] = y if indices is None else y[indices]
+
+    if scale_factors is not None:
+        block = _scale_for_plot(block, np.asarray(scale_factors)[:, None], owned=True)
+
+    xs = [x_data if indices is None else x_data[indices] for indices in all_indices]
+    return list(zip(xs, block))
+
+def _multi_axis_plot_params(n, kwargs):
+    """
+    Merge the user's plot parameters of a multi-axis plot with the defaults.
+
+    Default values are only built for the keys missing from kwargs.
+
+    Parameters:
+    - n: number of datasets
+    - kwargs: dictionary of user-provided plot parameters
+
+    Returns:
+    - dict of plot parameters
+    """
+    plot_params = dict(kwargs)
+    plot_params.setdefault('x_label', 'X-axis')
+    plot_params.setdefault('title', 'Interactive Multi-Axis 2D Plot')
+    plot_params.setdefault('figsize', (1000, 600))  # Plotly uses pixels
+    if 'y_labels' not in plot_params:
+        plot_params['y_labels'] = [f'Y-axis {j+1}' for j in range(n)]
+    if 'legend' not in plot_params:
+        plot_params['legend'] = [f'Dataset {j+1}' for j in range(n)]
+    if 'colors' not in plot_params:
+        plot_params['colors'] = list(islice(cycle(_BASE_COLORS), n))
+    if 'line_styles' not in plot_params:
+        plot_params['line_styles'] = ['solid'] * n
+    if 'line_widths' not in plot_params:
+        plot_params['line_widths'] = [2] * n
+    return plot_params
+
+def _trace_styles(plot_params):
+    """
+    Extract the per-trace styles of a multi-axis plot as tuples.
+
+    Parameters:
+    - plot_params: dict of plot parameters from _multi_axis_plot_params
+
+    Returns:
+    - (legend, colors, line_styles, line_widths) tuples
+    """
+    return (tuple(plot_params['legend']), tuple(plot_params['colors']),
+            tuple(plot_params['line_styles']), tuple(plot_params['line_widths']))
+
+def _multi_axis_layout(plot_params, n):
+    """
+    Build the layout of a multi-axis plot with one y-axis per dataset.
+
+    Grid settings are part of every axis dict, so the whole layout is applied
+    with a single update instead of separate update_xaxes/update_yaxes passes.
+
+    Parameters:
+    - plot_params: dict of plot parameters from _multi_axis_plot_params
+    - n: number of datasets
+
+    Returns:
+    - dict of layout properties
+    """
+    y_labels = plot_params['y_labels']
+    layout_updates = {
+        'title': plot_params['title'],
+        'xaxis': {'title': plot_params['x_label'], **_AXIS_GRID},
+        'yaxis': {'title': y_labels[0], 'side': 'left', **_AXIS_GRID},
+        'width': plot_params['figsize'][0],
+        'height': plot_params['figsize'][1],
+        'legend': {'yanchor': "top", 'y': 0.99, 'xanchor': "left", 'x': 0.01}
+    }
+
+    # Add additional y-axes, copying the properties they all share
+    for j in range(1, n):
+        yaxis = _YAXIS_TEMPLATE.copy()
+        yaxis['title'] = y_labels[j]
+        yaxis['side'] = 'right' if j & 1 else 'left'
+        yaxis['position'] = 1 - j * 0.05  # Adjust position to prevent overlap
+        layout_updates[f'yaxis{j+1}'] = yaxis
+    return layout_updates
+
+def plot2d_interactive_multi_axis(data, scale_factors=None, max_points=10_000, show=True, **kwargs):
     """
     Create an interactive 2D plot using Plotly with multiple y-axes and customizable parameters.
     
     Parameters:
-    - data: list of numpy arrays or 1D arrays, each representing a dataset to plot
+    - data: list of 1D or 2D (N, 2) array-likes, each representing a dataset to plot
     - scale_factors: list of scale factors for each dataset (optional)
+    - max_points: maximum number of points sent to the browser per trace (optional).
+      Longer datasets are reduced with min/max bucket decimation, None plots every sample.
+    - show: whether to display the figure (optional, defaults to True). Pass False
+      to only build it, e.g. for batch use or further customisation.
     - **kwargs: dictionary containing optional plot parameters
         - 'x_label': Label for the x-axis
         - 'y_labels': List of labels for each y-axis
@@ -17,82 +215,74 @@ def plot2d_interactive_multi_axis(data, scale_factors=None, **kwargs):
         - 'line_styles': List of line styles for each dataset
         - 'line_widths': List of line widths for each dataset
         - 'figsize': Tuple specifying the figure size (width, height)
+
+    Returns:
+    - plotly.graph_objects.Figure: the created figure
     """
 
     # Default parameters
-    default_params = {
-        'x_label': 'X-axis',
-        'y_labels': [f'Y-axis {j+1}' for j in range(len(data))],
-        'title': 'Interactive Multi-Axis 2D Plot',
-        'legend': [f'Dataset {j+1}' for j in range(len(data))],
-        'colors': ['blue', 'red', 'green', 'purple', 'orange'] * (len(data) // 5 + 1),
-        'line_styles': ['solid'] * len(data),
-        'line_widths': [2] * len(data),
-        'figsize': (1000, 600)  # Plotly uses pixels
-    }
-    
-    # Update default parameters with provided kwargs
-    plot_params = {**default_params, **kwargs}
+    plot_params = _multi_axis_plot_params(len(data), kwargs)
     
     fig = go.Figure()
 
     # If scale_factors is not provided, use 1 for all datasets
     if scale_factors is None:
-        scale_factors = [1] * len(data)
+        scale_factors = repeat(1)
+
+    # Look the per-trace styles up once, not on every loop iteration
+    legend, colors, line_styles, line_widths = _trace_styles(plot_params)
 
+    traces = []
+    x_cache = {}
     for j, (dataset, scale_factor) in enumerate(zip(data, scale_factors)):
-        if isinstance(dataset, np.ndarray) and dataset.ndim == 2:
-            x = dataset[:, 0]
-            y = dataset[:, 1] * scale_factor
-        elif isinstance(dataset, np.ndarray) and dataset.ndim == 1:
-            x = np.arange(1, len(dataset) + 1)
-            y = dataset * scale_factor
+        # Lists are accepted too; asarray does not copy numpy arrays
+        dataset = np.asarray(dataset)
+        if dataset.ndim == 2:
+            x, y = dataset[:, 0], dataset[:, 1]
+        elif dataset.ndim == 1:
+            x, y = None, dataset
         else:
-            raise ValueError("Each dataset should be a 1D or 2D numpy array.")
-        
-        fig.add_trace(
-            go.Scatter(
-                x=x,
-                y=y,
-                mode='lines',
-                name=plot_params['legend'][j],
-                line=dict(
-                    color=plot_params['colors'][j],
-                    dash=plot_params['line_styles'][j],
-                    width=plot_params['line_widths'][j]
-                ),
-                yaxis=f'y{j+1}' if j > 0 else 'y'
-            )
-        )
-
-    # Update layout with multiple y-axes
-    layout_updates = {
-        'title': plot_params['title'],
-        'xaxis': {'title': plot_params['x_label']},
-        'yaxis': {'title': plot_params['y_labels'][0], 'side': 'left'},
-        'width': plot_params['figsize'][0],
-        'height': plot_params['figsize'][1],
-        'legend': {'yanchor': "top", 'y': 0.99, 'xanchor': "left", 'x': 0.01}
-    }
+            raise ValueError(
+                "Each dataset should be a 1D array-like or a 2D (N, 2) array-like of x/y columns (e.g. a list or numpy array).")
 
-    # Add additional y-axes
-    for j in range(1, len(data)):
-        layout_updates[f'yaxis{j+1}'] = {
-            'title': plot_params['y_labels'][j],
-            'side': 'right' if j % 2 else 'left',
-            'overlaying': 'y',
-            'anchor': 'free',
-            'position': 1 - (j * 0.05)  # Adjust position to prevent overlap
-        }
-
-    fig.update_layout(**layout_updates)
-    
-    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='LightGray')
-    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='LightGray')
+        indices = _minmax_decimation_indices(y, max_points)
+        if indices is not None:
+            x = indices + 1 if x is None else x[indices]
+            y = y[indices]
+        elif x is None:
+            # Datasets usually share a length, so the index axis is built once per length
+            x = x_cache.get(len(y))
+            if x is None:
+                x = x_cache.setdefault(len(y), _index_axis(len(y)))
+        # Scale after decimation; the min/max samples are the same for any scale factor
+        y = _scale_for_plot(y, scale_factor, owned=indices is not None)
+
+        traces.append(dict(
+            type='scattergl' if len(y) > _WEBGL_THRESHOLD else 'scatter',
+            x=x,
+            y=y,
+            mode='lines',
+            name=legend[j],
+            line=dict(
+                color=colors[j],
+                dash=line_styles[j],
+                width=line_widths[j]
+            ),
+            yaxis=f'y{j+1}' if j > 0 else 'y'
+        ))
+
+    # Add all traces at once, so they are validated in a single pass
+    fig.add_traces(traces)
+
+    # Update layout with multiple y-axes; the dict is passed as is instead of
+    # being expanded into keyword arguments
+    fig.layout.update(_multi_axis_layout(plot_params, len(data)))
     
-    fig.show()
+    if show:
+        fig.show()
+    return fig
 
-def plot2d_interactive_multi_axis_with_x(x_data, y_data, scale_factors=None, **kwargs):
+def plot2d_interactive_multi_axis_with_x(x_data, y_data, scale_factors=None, max_points=10_000, show=True, **kwargs):
     """
     Create an interactive 2D plot using Plotly with multiple y-axes and customizable parameters.
     
@@ -100,8 +290,15 @@ def plot2d_interactive_multi_axis_with_x(x_data, y_data, scale_factors=None, **k
     - x_data: numpy array or 1D array for x-axis data
     - y_data: list of numpy arrays or 1D arrays, each representing a dataset to plot on y-axis
     - scale_factors: list of scale factors for each y dataset (optional)
+    - max_points: maximum number of points sent to the browser per trace (optional).
+      Longer datasets are reduced with min/max bucket decimation, None plots every sample.
+    - show: whether to display the figure (optional, defaults to True). Pass False
+      to only build it, e.g. for batch use or further customisation.
     - **kwargs: dictionary containing optional plot parameters
 
+    Returns:
+    - plotly.graph_objects.Figure: the created figure
+
     Example usage:
     ```python
     import numpy as np
@@ -132,76 +329,88 @@ def plot2d_interactive_multi_axis_with_x(x_data, y_data, scale_factors=None, **k
     ```
     """
     # Default parameters
-    default_params = {
-        'x_label': 'X-axis',
-        'y_labels': [f'Y-axis {j+1}' for j in range(len(y_data))],
-        'title': 'Interactive Multi-Axis 2D Plot',
-        'legend': [f'Dataset {j+1}' for j in range(len(y_data))],
-        'colors': ['blue', 'red', 'green', 'purple', 'orange'] * (len(y_data) // 5 + 1),
-        'line_styles': ['solid'] * len(y_data),
-        'line_widths': [2] * len(y_data),
-        'figsize': (1000, 600)  # Plotly uses pixels
-    }
-    
-    # Update default parameters with provided kwargs
-    plot_params = {**default_params, **kwargs}
+    plot_params = _multi_axis_plot_params(len(y_data), kwargs)
     
     fig = go.Figure()
 
-    # If scale_factors is not provided, use 1 for all datasets
-    if scale_factors is None:
-        scale_factors = [1] * len(y_data)
-
-    for j, (dataset, scale_factor) in enumerate(zip(y_data, scale_factors)):
-        fig.add_trace(
-            go.Scatter(
-                x=x_data,
-                y=dataset * scale_factor,
-                mode='lines',
-                name=plot_params['legend'][j],
-                line=dict(
-                    color=plot_params['colors'][j],
-                    dash=plot_params['line_styles'][j],
-                    width=plot_params['line_widths'][j]
-                ),
-                yaxis=f'y{j+1}' if j > 0 else 'y'
-            )
-        )
-
-    # Update layout with multiple y-axes
-    layout_updates = {
-        'title': plot_params['title'],
-        'xaxis': {'title': plot_params['x_label']},
-        'yaxis': {'title': plot_params['y_labels'][0], 'side': 'left'},
-        'width': plot_params['figsize'][0],
-        'height': plot_params['figsize'][1],
-        'legend': {'yanchor': "top", 'y': 0.99, 'xanchor': "left", 'x': 0.01}
-    }
+    x_data = np.asarray(x_data)
+    y_arrays = [np.asarray(dataset) for dataset in y_data]
+    if (len(y_arrays) > 1 and all(y.ndim == 1 and y.shape == y_arrays[0].shape for y in y_arrays)
+            and (scale_factors is None
+                 # Generators and other unsized iterables keep the per-dataset path
+                 or (hasattr(scale_factors, '__len__') and len(scale_factors) == len(y_arrays)))):
+        xy_pairs = _stacked_xy(x_data, y_arrays, scale_factors, max_points)
+    else:
+        # If scale_factors is not provided, use 1 for all datasets
+        if scale_factors is None:
+            scale_factors = repeat(1)
+        xy_pairs = []
+        for y, scale_factor in zip(y_arrays, scale_factors):
+            x = x_data
+            indices = _minmax_decimation_indices(y, max_points)
+            if indices is not None:
+                x = x[indices]
+                y = y[indices]
+            # Scale after decimation; the min/max samples are the same for any scale factor
+            xy_pairs.append((x, _scale_for_plot(y, scale_factor, owned=indices is not None)))
 
-    # Add additional y-axes
-    for j in range(1, len(y_data)):
-        layout_updates[f'yaxis{j+1}'] = {
-            'title': plot_params['y_labels'][j],
-            'side': 'right' if j % 2 else 'left',
-            'overlaying': 'y',
-            'anchor': 'free',
-            'position': 1 - (j * 0.05)  # Adjust position to prevent overlap
-        }
-
-    fig.update_layout(**layout_updates)
-    
-    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='LightGray')
-    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='LightGray')
+    # Look the per-trace styles up once, not on every loop iteration
+    legend, colors, line_styles, line_widths = _trace_styles(plot_params)
+
+    traces = []
+    for j, (x, y) in enumerate(xy_pairs):
+        traces.append(dict(
+            type='scattergl' if len(y) > _WEBGL_THRESHOLD else 'scatter',
+            x=x,
+            y=y,
+            mode='lines',
+            name=legend[j],
+            line=dict(
+                color=colors[j],
+                dash=line_styles[j],
+                width=line_widths[j]
+            ),
+            yaxis=f'y{j+1}' if j > 0 else 'y'
+        ))
+
+    # Add all traces at once, so they are validated in a single pass
+    fig.add_traces(traces)
+
+    # Update layout with multiple y-axes; the dict is passed as is instead of
+    # being expanded into keyword arguments
+    fig.layout.update(_multi_axis_layout(plot_params, len(y_data)))
     
-    fig.show()
+    if show:
+        fig.show()
+    return fig
 
-def plot_2d(data, **kwargs):
+@lru_cache(maxsize=64)
+def _rainbow_colors(n):
+    """
+    Sample n evenly spaced RGBA colors from the rainbow colormap.
+
+    The result is cached per n and shared between calls, so it is read-only.
+    """
+    colors = plt.cm.rainbow(np.linspace(0, 1, n))
+    colors.flags.writeable = False
+    return colors
+
+def plot_2d(data, ax=None, show=True, **kwargs):
     """
     Create a 2D plot using matplotlib with customizable parameters.
     
     Parameters:
-    - data: list of numpy arrays or 1D arrays, each representing a dataset to plot
+    - data: list of 1D or 2D (N, 2) array-likes, each representing a dataset to plot
+    - ax: matplotlib Axes to draw into (optional). The axes are cleared and reused,
+      which avoids creating a new figure on repeated updates.
+    - show: whether to call plt.show() (optional, defaults to True)
     - **kwargs: dictionary containing optional plot parameters
+
+    Returns:
+    - matplotlib.figure.Figure: the figure that was drawn into
+
+    Raises:
+    - ValueError: if 'legend', 'colors', 'line_styles' or 'markers' has fewer entries than data
     
     Example usage:
     ```python
@@ -224,45 +433,70 @@ def plot_2d(data, **kwargs):
     plot_2d([actual_eng_torque], **custom_params)
     ```
     """
-    # Default values
-    default_params = {
-        'x_label': 'X-axis',
-        'y_label': 'Y-axis',
-        'title': '2D Plot',
-        'legend': [f'Dataset {j+1}' for j in range(len(data))],
-        'colors': plt.cm.rainbow(np.linspace(0, 1, len(data))),
-        'line_styles': ['-', '--', '-.', ':'] * (len(data) // 4 + 1),
-        'markers': ['o', 's', '^', 'D', 'v', '*', 'p', 'h'] * (len(data) // 8 + 1),
-        'figsize': (10, 6)
-    }
-    
-    # Update default parameters with provided kwargs
-    plot_params = {**default_params, **kwargs}
+    # Merge provided kwargs with the defaults, building defaults only for missing keys
+    n = len(data)
+    plot_params = dict(kwargs)
+    plot_params.setdefault('x_label', 'X-axis')
+    plot_params.setdefault('y_label', 'Y-axis')
+    plot_params.setdefault('title', '2D Plot')
+    plot_params.setdefault('figsize', (10, 6))
+    if 'legend' not in plot_params:
+        plot_params['legend'] = [f'Dataset {j+1}' for j in range(n)]
+    if 'colors' not in plot_params:
+        plot_params['colors'] = _rainbow_colors(n)
+    if 'line_styles' not in plot_params:
+        plot_params['line_styles'] = list(islice(cycle(_LINE_STYLES), n))
+    if 'markers' not in plot_params:
+        plot_params['markers'] = list(islice(cycle(_MARKERS), n))
+
+    # The lines are styled by zipping with these lists, so a short list would
+    # silently leave the remaining lines unstyled
+    for key in ('legend', 'colors', 'line_styles', 'markers'):
+        if len(plot_params[key]) < n:
+            raise ValueError(f"'{key}' must have an entry for each of the {n} datasets, "
+                             f"got {len(plot_params[key])}.")
     
-    # Create the plot
-    plt.figure(figsize=plot_params['figsize'])
+    # Create the plot, or reuse the given axes
+    if ax is None:
+        # Constrained layout is solved during the draw, no separate tight_layout pass
+        fig, ax = plt.subplots(figsize=plot_params['figsize'], layout='constrained')
+    else:
+        fig = ax.figure
+        ax.cla()
     
-    for j, dataset in enumerate(data):
+    x_cache = {}
+    xy_args = []
+    for dataset in data:
+        dataset = np.asarray(dataset)
         if dataset.ndim == 1:
-            # If dataset is 1D, use array index as x-values
-            x = np.arange(1, len(dataset) + 1)
+            # If dataset is 1D, use array index as x-values (built once per length)
+            x = x_cache.get(len(dataset))
+            if x is None:
+                x = x_cache.setdefault(len(dataset), _index_axis(len(dataset)))
             y = dataset
-        else:
+        elif dataset.ndim == 2:
             # If dataset is 2D, use first column as x and second as y
             x = dataset[:, 0]
             y = dataset[:, 1]
-        
-        plt.plot(x, y, 
-                 color=plot_params['colors'][j],
-                 linestyle=plot_params['line_styles'][j],
-                 marker=plot_params['markers'][j],
-                 label=plot_params['legend'][j])
+        else:
+            raise ValueError(
+                "Each dataset should be a 1D array-like or a 2D (N, 2) array-like of x/y columns (e.g. a list or numpy array).")
+        xy_args += (x, y)
+
+    # Draw all datasets with a single plot call, then style each line
+    lines = ax.plot(*xy_args)
+    for line, color, line_style, marker, label in zip(lines, plot_params['colors'],
+                                                      plot_params['line_styles'],
+                                                      plot_params['markers'],
+                                                      plot_params['legend']):
+        line.set(color=color, linestyle=line_style, marker=marker, label=label)
     
-    plt.xlabel(plot_params['x_label'])
-    plt.ylabel(plot_params['y_label'])
-    plt.title(plot_params['title'])
-    plt.legend()
-    plt.grid(True, linestyle='--', alpha=0.7)
+    ax.set_xlabel(plot_params['x_label'])
+    ax.set_ylabel(plot_params['y_label'])
+    ax.set_title(plot_params['title'])
+    ax.legend()
+    ax.grid(True, linestyle='--', alpha=0.7)
     
-    plt.tight_layout()
-    plt.show()
+    if show:
+        plt.show()
+    return fig
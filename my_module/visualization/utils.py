@@ -1,3 +1,33 @@
+from functools import lru_cache
+from itertools import cycle, islice
+
+# 预定义颜色集，包含明亮色、深色和中性色，确保区分度明显
+_COLORS = (
+    '#FF5733', '#33FF57', '#5733FF', '#FFD700',  # 明亮色
+    '#00BFFF', '#FF4500', '#A9A9A9', '#6B8E23',  # 中性/深色
+    '#8B4513', '#4682B4', '#BC8F8F', '#D3D3D3',  # 深色/浅色
+    '#FF1493', '#00FFFF', '#1E90FF', '#FF6347',  # 更多明亮色
+    '#7FFF00', '#FF00FF', '#FF6347', '#708090',  # 中性/暗色
+    '#00FF00', '#CD853F', '#F0E68C', '#FAFAD2',  # 较柔和色
+    '#E6E6FA', '#F5DEB3', '#BC8F8F', '#778899'   # 更多中性色
+)
+
+@lru_cache(maxsize=128)
+def _palette_cached(num_curves):
+    """
+    生成(并缓存)指定曲线数量的调色板。
+
+    参数:
+    num_curves (int): 曲线数量
+
+    返回:
+    tuple: 十六进制颜色的元组
+    """
+    # 曲线数量不超过预定义颜色集时直接切片，否则循环选择颜色
+    if num_curves <= len(_COLORS):
+        return _COLORS[:max(num_curves, 0)]
+    return tuple(islice(cycle(_COLORS), num_curves))
+
 def get_color_palette(num_curves):
     """
     根据曲线数量返回最佳的颜色组合数组，确保颜色对比明显。
@@ -26,18 +56,5 @@ def get_color_palette(num_curves):
     plt.show()
     ```
     """
-    # 预定义颜色集，包含明亮色、深色和中性色，确保区分度明显
-    colors = [
-        '#FF5733', '#33FF57', '#5733FF', '#FFD700',  # 明亮色
-        '#00BFFF', '#FF4500', '#A9A9A9', '#6B8E23',  # 中性/深色
-        '#8B4513', '#4682B4', '#BC8F8F', '#D3D3D3',  # 深色/浅色
-        '#FF1493', '#00FFFF', '#1E90FF', '#FF6347',  # 更多明亮色
-        '#7FFF00', '#FF00FF', '#FF6347', '#708090',  # 中性/暗色
-        '#00FF00', '#CD853F', '#F0E68C', '#FAFAD2',  # 较柔和色
-        '#E6E6FA', '#F5DEB3', '#BC8F8F', '#778899'   # 更多中性色
-    ]
-    
-    # 如果曲线数量大于预定义颜色集，则通过循环选择颜色
-    palette = [colors[i % len(colors)] for i in range(num_curves)]
-    
-    return palette
+    # 相同曲线数量的调色板只生成一次，返回列表副本以免调用方修改缓存
+    return list(_palette_cached(num_curves))